@@ -5,15 +5,26 @@ from threading import Thread
 from TicketService import TicketService
 from TicketStatusService import TicketStatusService
 from ProgressIndicator import ProgressIndicator
+from ResultsView import ResultsView
+from TicketStore import TicketSync
+from Ticket import Ticket
+from generations import SearchGenerations
+from Debouncer import Debouncer
+from DiagnosticsPanel import DiagnosticsPanel
+from log import log, warning
 
 #Connectwise API
 class App:
-    def __init__(self, root, api_client):
+    def __init__(self, root, api_client, store=None):
         self.root = root
         self.api_client = api_client
+        self.store = store
 
-        self.ticket_service = TicketService(api_client)
-        self.status_service = TicketStatusService(api_client)
+        self.ticket_service = TicketService(api_client, store=store)
+        self.status_service = TicketStatusService(api_client, store=store)
+
+        # Starting any search supersedes the one still running
+        self.generations = SearchGenerations()
 
         self.root.title("ConnectWise Ticket Viewer")
 
@@ -48,6 +59,12 @@ class App:
         )
         self.limit_combo_user.pack()
 
+        # Search-as-you-type (debounced) on the username field
+        self.live_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.tab_user, text="Search as you type", variable=self.live_var).pack()
+        self.debouncer = Debouncer(root, self.start_user_search)
+        self.user_entry.bind("<KeyRelease>", self._on_typing)
+
         tk.Button(self.tab_user, text="Search", command=self.start_user_search).pack(pady=5)
 
         # ============================================================
@@ -81,48 +98,90 @@ class App:
         self.duration_label = tk.Label(root, text="", fg="gray")
         self.duration_label.pack()
 
+        # Local store: searches are answered offline unless this is ticked
+        self.refresh_var = tk.BooleanVar(value=store is None)
+        if store is not None:
+            tk.Checkbutton(root, text="Refresh from server", variable=self.refresh_var).pack()
+            Thread(target=self.sync_store, daemon=True).start()
+
+        tk.Button(root, text="Diagnostics", command=self.open_diagnostics).pack()
+
         self.progress = ProgressIndicator(root)
 
-        self.output_box = tk.Text(root, width=120, height=25)
-        self.output_box.pack(expand=True, fill="both")
+        self.results = ResultsView(
+            root,
+            columns=[
+                ("id", "Ticket", 80),
+                ("summary", "Summary", 360),
+                ("owner", "Owner", 110),
+                ("status", "Status", 120),
+                ("board", "Board", 120),
+                ("team", "Team", 120),
+                ("updated", "Last Updated", 160),
+            ],
+            row_builder=self._ticket_row,
+            on_open=self.open_ticket,
+            metrics=api_client.metrics
+        )
+
+    # ===================================================================
+    # LOCAL STORE SYNC
+    # ===================================================================
+    def sync_store(self):
+        try:
+            result = TicketSync(self.api_client, self.store).sync()
+            log(f"Ticket store sync: {result}")
+        except Exception as e:
+            warning(f"Ticket store sync failed: {e}")
+
+    def open_diagnostics(self):
+        DiagnosticsPanel(self.root, self.api_client.metrics)
 
     # ===================================================================
     # USERNAME SEARCH
     # ===================================================================
+    def _on_typing(self, event=None):
+        if self.live_var.get():
+            self.debouncer.trigger()
+
     def start_user_search(self):
-        self.output_box.delete("1.0", tk.END)
+        self.debouncer.cancel()
+        generation = self.generations.start()
+
+        self.results.clear()
         self.progress.start()
-        Thread(target=self.search_by_user, daemon=True).start()
+        Thread(target=self.search_by_user, args=(generation,), daemon=True).start()
 
-    def search_by_user(self):
+    def search_by_user(self, generation):
         username = self.user_entry.get().strip()
         limit = int(self.limit_var_user.get())
 
         try:
             tickets, duration = self.ticket_service.get_tickets_for_user(
-                username, limit=limit
+                username, limit=limit, refresh=self.refresh_var.get()
             )
-            self.root.after(0, lambda: self.duration_label.config(
+            self._post(generation, lambda: self.duration_label.config(
                 text=f"Query time: {duration} ms"
             ))
         except Exception as e:
-            self.root.after(0, lambda err=e: self.output_box.insert(
-                tk.END, f"Error: {err}\n"
-            ))
-            self.root.after(0, self.progress.stop)
+            self._post(generation, lambda err=e: self.results.set_message(f"Error: {err}"))
+            self._post(generation, self.progress.stop)
             return
 
-        self.root.after(0, lambda: self.render_results(tickets, f"Tickets for '{username}'"))
+        self._post(generation, lambda: self.render_results(tickets, f"Tickets for '{username}'"))
 
     # ===================================================================
     # STATUS + BOARD SEARCH
     # ===================================================================
     def start_status_search(self):
-        self.output_box.delete("1.0", tk.END)
+        self.debouncer.cancel()
+        generation = self.generations.start()
+
+        self.results.clear()
         self.progress.start()
-        Thread(target=self.search_by_status, daemon=True).start()
+        Thread(target=self.search_by_status, args=(generation,), daemon=True).start()
 
-    def search_by_status(self):
+    def search_by_status(self, generation):
         board = self.board_entry.get().strip() or None
         status = self.status_entry.get().strip() or None
         limit = int(self.limit_var_status.get())
@@ -131,55 +190,83 @@ class App:
             tickets, duration = self.status_service.get_tickets_by_status(
                 board_name=board,
                 status_name=status,
-                limit=limit
+                limit=limit,
+                refresh=self.refresh_var.get()
             )
-            self.root.after(0, lambda: self.duration_label.config(
+            self._post(generation, lambda: self.duration_label.config(
                 text=f"Query time: {duration} ms"
             ))
         except Exception as e:
-            self.root.after(0, lambda err=e: self.output_box.insert(
-                tk.END, f"Error: {err}\n"
-            ))
-            self.root.after(0, self.progress.stop)
+            self._post(generation, lambda err=e: self.results.set_message(f"Error: {err}"))
+            self._post(generation, self.progress.stop)
             return
 
         label = f"Tickets (Board={board}, Status={status})"
-        self.root.after(0, lambda: self.render_results(tickets, label))
+        self._post(generation, lambda: self.render_results(tickets, label))
 
     # ===================================================================
     # SHARED RESULT RENDERING
     # ===================================================================
+    def _post(self, generation, callback):
+        # Results of a superseded search are dropped, not rendered
+        def run():
+            if self.generations.is_current(generation):
+                callback()
+        self.root.after(0, run)
+
     def render_results(self, tickets, label):
         self.progress.stop()
 
-        self.output_box.insert(tk.END, f"{label}:\n\n")
-
         if not tickets:
-            self.output_box.insert(tk.END, "No tickets found.\n")
+            self.results.set_message(f"{label}: no tickets found.")
             return
 
+        self.results.set_message(f"{label}: {len(tickets)}")
+        self.results.append(tickets)
+
         for t in tickets:
-            tid = t.get("id", "N/A")
-            summary = t.get("summary", "")
-            owner = t.get("owner", {}).get("identifier", "")
-            status = t.get("status", {}).get("name", "")
-            board = t.get("board", {}).get("name", "")
-            team = t.get("team", {}).get("name", "")
-            updated = t.get("lastUpdated", "")
-
-            # Replace YOUR_URL with your ConnectWise site
-            ticket_link = f"https://<YOUR_URL>/ConnectWise.aspx?routeTo=Ticket/{tid}"
-
-            self.output_box.insert(
-                tk.END,
-                f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"Ticket #{tid}\n"
-                f"Summary      : {summary}\n"
-                f"Owner        : {owner}\n"
-                f"Status       : {status}\n"
-                f"Board        : {board}\n"
-                f"Team         : {team}\n"
-                f"Last Updated : {updated}\n"
-                f"Link         : {ticket_link}\n"
-                f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            )
\ No newline at end of file
+            self.results.set_detail(t.id, self._ticket_summary(t))
+
+    def _ticket_row(self, t):
+        return t.id, (
+            t.id,
+            t.summary,
+            t.owner,
+            t.status,
+            t.board,
+            t.team,
+            t.last_updated or "",
+        )
+
+    def _ticket_summary(self, t):
+        tid = t.id
+
+        # Replace YOUR_URL with your ConnectWise site
+        ticket_link = f"https://<YOUR_URL>/ConnectWise.aspx?routeTo=Ticket/{tid}"
+
+        return (
+            f"Ticket #{tid}\n"
+            f"Summary      : {t.summary}\n"
+            f"Owner        : {t.owner}\n"
+            f"Status       : {t.status}\n"
+            f"Board        : {t.board}\n"
+            f"Team         : {t.team}\n"
+            f"Last Updated : {t.last_updated or ''}\n"
+            f"Link         : {ticket_link}\n"
+        )
+
+    # ===================================================================
+    # LAZY TICKET DETAIL
+    # ===================================================================
+    def open_ticket(self, tid):
+        Thread(target=self._load_detail, args=(tid,), daemon=True).start()
+
+    def _load_detail(self, tid):
+        try:
+            t = Ticket.from_api(self.api_client.get_ticket_detail(tid))
+        except Exception as e:
+            warning(f"Failed to fetch detail for ticket {tid}: {e}", ticket_id=tid)
+            return
+
+        text = self._ticket_summary(t) + "\n" + t.initial_description
+        self.root.after(0, lambda: self.results.set_detail(tid, text))
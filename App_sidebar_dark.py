@@ -2,20 +2,59 @@ import tkinter as tk
 from tkinter import ttk
 from threading import Thread
 import json
+import time
 
 from Styles import DARK_BG, DARK_PANEL, DARK_TEXT, ACCENT, apply_styles, create_page_size_dropdown
 from TicketService import TicketService
 from TicketStatusService import TicketStatusService
 from ProgressIndicator import ProgressIndicator
-from log import log
+from ResultsView import ResultsView
+from NotesPrefetcher import NotesPrefetcher
+from SearchIndex import TicketSearchIndex
+from identifiers import IdentifierExtractor
+from board_metadata import BoardMetadataCache
+from ChangeWatcher import ChangeWatcher
+from Ticket import Ticket
+from generations import SearchGenerations
+from Debouncer import Debouncer
+from DiagnosticsPanel import DiagnosticsPanel
+from log import log, warning, new_request_id
+from timer import Timer
 from orderby import OrderBy
+from query import Query
 
 
 
 class AppSidebarDark:
-    def __init__(self, root, api_client):
+
+    # Tickets handed to the UI thread per render callback
+    RENDER_BATCH = 25
+
+    # Seconds between change-watch polls (stretched while nothing changes)
+    WATCH_INTERVAL = 30
+    WATCH_MAX_INTERVAL = 300
+
+    # How often to check whether board metadata has outlived its TTL
+    METADATA_CHECK_MS = 10 * 60 * 1000
+
+    def __init__(self, root, api_client, search_index=None, board_metadata=None):
         self.root = root
         self.api_client = api_client
+        self.search_index = search_index or TicketSearchIndex()
+        self.identifier_extractor = IdentifierExtractor()
+
+        # Starting a search cancels the previous one; _results are the
+        # tickets shown for the current generation
+        self.generations = SearchGenerations()
+        self._results = []
+
+        # Revalidated pages wait here until the search's last batch is shown
+        self._streaming = False
+        self._queued_updates = []
+
+        # Change watch over the last completed unified search
+        self.watcher = None
+        self._watch_target = None   # (conditions, generation)
 
         # Theme
         apply_styles()
@@ -25,8 +64,9 @@ class AppSidebarDark:
         # Services
         self.ticket_service = TicketService(api_client)
         self.status_service = TicketStatusService(api_client)
+        self.notes_prefetcher = NotesPrefetcher(api_client, index=self.search_index)
 
-        # Board → Status mapping
+        # Board → Status mapping, used until board metadata has been loaded
         self.board_status_map = {
             "MNS Config": [
                 "Pending Allocation", "Rejected", "Reject Resolved", "Assigned",
@@ -38,6 +78,9 @@ class AppSidebarDark:
                 "Rejected", "Scheduled", "Success"
             ]
         }
+        self.board_metadata = board_metadata or BoardMetadataCache(
+            api_client, fallback=self.board_status_map
+        )
 
         # Layout
         self.sidebar = tk.Frame(root, bg=DARK_PANEL, width=320, padx=12, pady=12)
@@ -77,7 +120,7 @@ class AppSidebarDark:
         self.board_var = tk.StringVar()
         self.board_entry = ttk.Combobox(
             self.sidebar, textvariable=self.board_var,
-            values=list(self.board_status_map.keys()),
+            values=self.board_metadata.board_names(),
             state="readonly", font=("Segoe UI", 11)
         )
         self.board_entry.pack(fill="x", pady=(0, 6))
@@ -92,6 +135,14 @@ class AppSidebarDark:
         )
         self.status_entry.pack(fill="x", pady=(0, 10))
 
+        # Text (full-text search over locally indexed tickets)
+        ttk.Label(self.sidebar, text="Text (offline index)").pack(anchor="w")
+        self.text_entry = tk.Entry(
+            self.sidebar, bg="#33373b", fg=DARK_TEXT,
+            insertbackground=DARK_TEXT, font=("Segoe UI", 11)
+        )
+        self.text_entry.pack(fill="x", pady=(0, 10))
+
         # Order By
         ttk.Label(self.sidebar, text="Order").pack(anchor="w")
 
@@ -106,6 +157,19 @@ class AppSidebarDark:
         )
         self.order_entry.pack(fill="x", pady=(0, 10))
 
+        # Search-as-you-type on Company / Username (debounced)
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.sidebar, text="Search as you type", variable=self.live_var)\
+            .pack(anchor="w", pady=(0, 6))
+        self.debouncer = Debouncer(root, self.start_unified_search)
+        self.company_entry.bind("<KeyRelease>", self._on_typing)
+        self.user_entry.bind("<KeyRelease>", self._on_typing)
+
+        # Poll for changed tickets and apply them to the current results
+        self.watch_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.sidebar, text="Watch for changes", variable=self.watch_var,
+                        command=self._toggle_watch).pack(anchor="w", pady=(0, 6))
+
         # Search button
         self.search_button = ttk.Button(self.sidebar, text="Search", command=self.start_unified_search)
         self.search_button.pack(fill="x", pady=(10, 10))
@@ -117,120 +181,251 @@ class AppSidebarDark:
         self.duration_label = ttk.Label(self.sidebar, text="")
         self.duration_label.pack(anchor="w", pady=(6, 0))
 
-        # --- Scrollable Text Output ---
-        output_frame = tk.Frame(self.main, bg=DARK_BG)
-        output_frame.pack(fill="both", expand=True)
-
-        # Scrollbar (thicker)
-        scrollbar = tk.Scrollbar(output_frame, width=18)  # try 12,16,18,20,24
-        scrollbar.pack(side="right", fill="y")
-
-        self.output_box = tk.Text(
-            output_frame,
+        # Request / render metrics
+        ttk.Button(self.sidebar, text="Diagnostics", command=self.open_diagnostics)\
+            .pack(fill="x", pady=(10, 0))
+
+        # --- Virtualized results + detail pane ---
+        self.results = ResultsView(
+            self.main,
+            columns=[
+                ("id", "Ticket", 80),
+                ("summary", "Summary", 380),
+                ("owner", "Owner", 110),
+                ("company", "Company", 180),
+                ("status", "Status", 130),
+                ("board", "Board", 130),
+            ],
+            row_builder=self._ticket_row,
             bg="#111316",
             fg=DARK_TEXT,
-            insertbackground=DARK_TEXT,
-            wrap="word",
-            padx=8,
-            pady=8,
-            yscrollcommand=scrollbar.set
+            metrics=api_client.metrics
         )
-        self.output_box.pack(side="left", fill="both", expand=True)
 
-        scrollbar.config(command=self.output_box.yview)
+        api_client.metrics.add_source("board_metadata", self.board_metadata.stats)
+        self._check_board_metadata()
+
+    def open_diagnostics(self):
+        DiagnosticsPanel(self.root, self.api_client.metrics)
 
     # ----------------------------------------------------
-    # Status dropdown updater
+    # Board / Status dropdown updaters
     # ----------------------------------------------------
+    def _check_board_metadata(self):
+        # Reloads in the background once the TTL has passed, then checks again later
+        if self.board_metadata.is_stale():
+            self.board_metadata.refresh_async(
+                on_ready=lambda: self.root.after(0, self._update_board_dropdown)
+            )
+        self.root.after(self.METADATA_CHECK_MS, self._check_board_metadata)
+
+    def _update_board_dropdown(self):
+        boards = self.board_metadata.board_names()
+        self.board_entry["values"] = boards
+
+        # Keep the current selection if it still exists
+        if self.board_var.get() in boards:
+            statuses = self.board_metadata.status_names(self.board_var.get())
+            self.status_entry["values"] = statuses
+            if self.status_var.get() not in statuses:
+                self.status_var.set("")
+        else:
+            self.board_var.set("")
+            self._update_status_dropdown()
+
     def _update_status_dropdown(self, event=None):
         board = self.board_var.get()
-        statuses = self.board_status_map.get(board, [])
-        self.status_entry["values"] = statuses
+        self.status_entry["values"] = self.board_metadata.status_names(board)
         self.status_var.set("")
 
     # ----------------------------------------------------
     # Unified Search
     # ----------------------------------------------------
-    def start_unified_search(self):
-        self.output_box.delete("1.0", tk.END)
-        self.progress.start()
-        Thread(target=self._unified_search, daemon=True).start()
+    def _on_typing(self, event=None):
+        if self.live_var.get():
+            self.debouncer.trigger()
 
-    def _unified_search(self):
-        full_conditions = self.build_conditions()
+    def start_unified_search(self):
+        self.debouncer.cancel()
+        self._stop_watch()
+        self._watch_target = None
+        generation = self.generations.start()
 
-        log(f"Unified search conditions = {full_conditions}")
+        self.results.clear()
+        self.progress.start()
+        self._results = []
+        self._streaming = False
+        self._queued_updates = []
+
+        if text := self.text_entry.get().strip():
+            Thread(target=self._text_search, args=(text, generation), daemon=True).start()
+        else:
+            self._streaming = True
+            Thread(target=self._unified_search, args=(generation, self._results), daemon=True).start()
+
+    def _post(self, generation, callback):
+        # Schedules UI work unless a newer search has superseded this one
+        def run():
+            if self.generations.is_current(generation):
+                callback()
+        self.root.after(0, run)
+
+    def _text_search(self, text, generation):
+        log(f"Text search = {text}")
 
         try:
-            tickets = self.api_client.get_tickets(
-                conditions=full_conditions,
-                page=1,
-                page_size=50,
-                order_by=self.get_order_by(),
-                full_response=True
+            # Exact identifier hits (MAC, IP, SIM ID, TN, ...) need no scan
+            owners = sorted(self.identifier_extractor.lookup(text))
+
+            results = self.search_index.search(
+                text,
+                board=self.board_entry.get().strip() or None,
+                status=self.status_entry.get().strip() or None,
+                limit=int(self.page_size_var.get())
             )
 
-            log(f"Received {len(tickets)} tickets")
-
-            # TEMP DEBUG
-            if tickets:
-                first_id = tickets[0]["id"]
-                self.api_client.debug_get_full_ticket(first_id)
-
-            self.root.after(0, lambda: self.display_tickets(tickets, "Unified Search"))
-            self.root.after(
-                0,
-                lambda: self.duration_label.config(text=f"Results: {len(tickets)} tickets")
+            self._post(generation, lambda: self.display_text_results(results, text, owners))
+            self._post(
+                generation,
+                lambda: self.duration_label.config(text=f"Results: {len(results)} tickets")
             )
 
         except Exception as e:
-            self.root.after(
-                0,
-                lambda e=e: self.output_box.insert(tk.END, f"Error: {e}\n")
-            )
+            self._post(generation, lambda e=e: self.results.set_message(f"Error: {e}"))
 
         finally:
-            self.root.after(0, self.progress.stop)
+            self._post(generation, self.progress.stop)
 
-    def build_conditions(self):
-        conditions = []
+    def _unified_search(self, generation, results):
+        full_conditions = self.build_conditions()
+        limit = int(self.page_size_var.get())
+
+        request_id = new_request_id()
+        log(f"Unified search conditions = {full_conditions}", request_id=request_id)
 
-        if company := self.company_entry.get().strip():
-            conditions.append(
-                f'(company/name contains "{company}" '
-                f'OR company/identifier contains "{company}")'
+        self._post(generation, lambda: self.results.set_message("Results for Unified Search"))
+
+        try:
+            count = 0
+            batch = []
+
+            with Timer() as t:
+                # Tickets are decoded as each page downloads and rendered in
+                # small batches. Repeat searches are served from the result
+                # cache at once and re-rendered if revalidation finds changes.
+                for ticket in self.api_client.iter_tickets(
+                    conditions=full_conditions,
+                    max_results=limit,
+                    order_by=self.get_order_by(),
+                    use_cache=True,
+                    on_update=lambda page, fresh: self._page_updated(generation, limit, page, fresh),
+                    stream=True
+                ):
+                    # Superseded: stop paging (closing the iterator drops its prefetch)
+                    if generation.cancelled:
+                        log("Unified search superseded", request_id=request_id)
+                        return
+
+                    # TEMP DEBUG (no-op unless payload logging is enabled)
+                    if count == 0:
+                        self.api_client.debug_get_full_ticket(ticket["id"])
+
+                    count += 1
+                    batch.append(ticket)
+                    if len(batch) >= self.RENDER_BATCH:
+                        self._flush_batch(batch, results, generation)
+                        batch = []
+
+                if batch:
+                    self._flush_batch(batch, results, generation)
+
+            if count == 0:
+                self._post(generation, lambda: self.results.set_message("No tickets found."))
+
+            log(f"Received {count} tickets", request_id=request_id, latency_ms=t.ms())
+            log(f"Connection pool: {self.api_client.pool_stats()}", request_id=request_id)
+
+            self._post(
+                generation,
+                lambda: self.duration_label.config(text=f"Results: {count} tickets")
             )
+            self._post(generation, lambda: self._search_completed(full_conditions, generation))
 
-        if username := self.user_entry.get().strip():
-            conditions.append(f'owner/identifier contains "{username}"')
+        except Exception as e:
+            self._post(generation, lambda e=e: self.results.set_message(f"Error: {e}"))
+
+        finally:
+            self._post(generation, lambda: self._finish_streaming(generation))
+            self._post(generation, self.progress.stop)
 
-        if board := self.board_entry.get().strip():
-            conditions.append(f'board/name="{board}"')
+    def _page_updated(self, generation, limit, page, fresh):
+        # Revalidation thread: index and convert here, splice on the UI thread
+        if not self.generations.is_current(generation):
+            return
 
-        if status := self.status_entry.get().strip():
-            conditions.append(f'status/name="{status}"')
+        self.search_index.index_tickets(fresh)
+        fresh_tickets = [Ticket.from_api(t) for t in fresh]
+        self._post(generation, lambda: self._apply_page_update(generation, limit, page, fresh_tickets))
 
-        return " AND ".join(conditions) if conditions else None
+    def _apply_page_update(self, generation, limit, page, fresh_tickets):
+        # Batches still to come would land after the spliced page; wait for them
+        if self._streaming:
+            self._queued_updates.append((limit, page, fresh_tickets))
+            return
+        self._splice_page(limit, page, fresh_tickets)
+        self._rerender_results(generation)
+
+    def _finish_streaming(self, generation):
+        # Posted after the search's last batch, so every row is in place
+        self._streaming = False
+        updates, self._queued_updates = self._queued_updates, []
+        for limit, page, fresh_tickets in updates:
+            self._splice_page(limit, page, fresh_tickets)
+        if updates:
+            self._rerender_results(generation)
+
+    def _splice_page(self, limit, page, fresh_tickets):
+        # In place: the search thread's batches were appended to this same list
+        page_size = min(limit, self.api_client.MAX_PAGE_SIZE)
+        start = (page - 1) * page_size
+        fresh_ids = {t.id for t in fresh_tickets}
+
+        before = [t for t in self._results[:start] if t.id not in fresh_ids]
+        after = [t for t in self._results[start + page_size:] if t.id not in fresh_ids]
+        self._results[:] = (before + fresh_tickets + after)[:limit]
+
+    def _rerender_results(self, generation):
+        log("Cached results changed on the server; re-rendering")
+        self.results.clear()
+        self.display_tickets(list(self._results), "Unified Search (updated)", generation)
+        self.duration_label.config(text=f"Results: {len(self._results)} tickets (updated)")
+
+    def _flush_batch(self, batch, results, generation):
+        # The index takes the raw payloads; the UI keeps compact Tickets.
+        # `results` is only touched on the UI thread.
+        self.search_index.index_tickets(batch)
+        tickets = [Ticket.from_api(t) for t in batch]
+        self._post(generation, lambda: self._append_batch(tickets, results, generation))
+
+    def _append_batch(self, tickets, results, generation):
+        results.extend(tickets)
+        self.append_tickets(tickets, generation)
 
-    def extract_identifiers(self, text):
-        identifiers = {}
+    def build_conditions(self):
+        return (
+            Query()
+            .company_like(self.company_entry.get())
+            .owner(self.user_entry.get())
+            .board(self.board_entry.get())
+            .status(self.status_entry.get())
+        )
 
-        patterns = {
-            "Equipment Ticket": r"EQUIPMENTTICKET:\s*(\d+)",
-            "Mobility Ticket": r"MOBILITY TICKET:\s*(\d+)",
-            "SIM ID": r"SIM\s*1\s*ID:\s*([0-9]+)",
-            "TN": r"TN:\s*([0-9]+)",
-            "IP Address": r"IP Address:\s*([\d\.]+)",
-            "Subnet Mask": r"Subnet Mask:\s*([\d\.]+)",
-            "Default Gateway": r"Default Gateway:\s*([\d\.]+)",
-            "MAC Address": r"Mac:\s*([0-9A-Fa-f]+)",
-        }
+    def extract_identifiers(self, text, ticket_id=None):
+        identifiers = self.identifier_extractor.extract(text)
 
-        import re
-        for label, pattern in patterns.items():
-            match = re.search(pattern, text)
-            if match:
-                identifiers[label] = match.group(1)
+        # Remember where each value came from for identifier lookups
+        if ticket_id is not None:
+            self.identifier_extractor.index(ticket_id, identifiers)
 
         return identifiers
 
@@ -244,63 +439,133 @@ class AppSidebarDark:
     # ----------------------------------------------------
     # Ticket Renderer
     # ----------------------------------------------------
-    def display_tickets(self, tickets, header_label):
-        self.output_box.insert(tk.END, f"Results for {header_label}:\n\n")
-
+    def display_tickets(self, tickets, header_label, generation):
         if not tickets:
-            self.output_box.insert(tk.END, "No tickets found.\n")
+            self.results.set_message(f"Results for {header_label}: no tickets found.")
             return
 
-        for t in tickets:
-
-            tid = t.get("id", "N/A")
-            summary = t.get("summary", "")
-            owner = t.get("owner", {}).get("identifier", "")
-            company = t.get("company", {}).get("name", "")
-            company_id = t.get("company", {}).get("identifier", "")
-            status = t.get("status", {}).get("name", "")
-            board = t.get("board", {}).get("name", "")
-
-            # ------------------------------------------------
-            # Initial Description (fetched from notes)
-            # ------------------------------------------------
-            description = ""
-
-            try:
-                notes = self.api_client.get_ticket_notes(
-                    tid,
-                    detail=True,
-                    internal=False,
-                    resolution=False
-                )
-
-                for note in notes:
-                    if note.get("detailDescriptionFlag"):
-                        description = note.get("text", "").strip()
-                        break
-
-            except Exception as e:
-                log(f"Failed to fetch notes for ticket {tid}: {e}")
-
-            identifiers = self.extract_identifiers(description)
-
-            self.output_box.insert(
-                tk.END,
-                "━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                f"Ticket # {tid}\n"
-                f"Summary      : {summary}\n"
-                f"Owner        : {owner}\n"
-                f"Company      : {company} ({company_id})\n"
-                f"Status       : {status}\n"
-                f"Board        : {board}\n\n"
-            )
+        self.results.set_message(f"Results for {header_label}")
+        self.append_tickets(tickets, generation)
+
+    def append_tickets(self, tickets, generation):
+        self.results.append(tickets)
+        self._prefetch_descriptions(tickets, generation)
+
+    def _prefetch_descriptions(self, tickets, generation):
+        # ------------------------------------------------
+        # Initial Descriptions (fetched from notes, concurrently)
+        # Queued fetches are cancelled when the search is superseded.
+        # ------------------------------------------------
+        generation.track(self.notes_prefetcher.prefetch(
+            [t.id for t in tickets if t.id is not None],
+            on_result=lambda tid, d: self._description_loaded(tid, d, generation),
+            on_error=lambda tid, e: self._description_failed(tid, e, generation)
+        ))
+
+    # ----------------------------------------------------
+    # Change watch
+    # ----------------------------------------------------
+    def _search_completed(self, conditions, generation):
+        self._watch_target = (conditions, generation)
+        if self.watch_var.get():
+            self._start_watch()
+
+    def _toggle_watch(self):
+        if self.watch_var.get():
+            self._start_watch()
+        else:
+            self._stop_watch()
+
+    def _start_watch(self):
+        if self._watch_target is None or (self.watcher and self.watcher.running):
+            return
 
-            # ---- Identifiers (if present) ----
-            if identifiers:
-                self.output_box.insert(tk.END, "Identifiers:\n")
-                for k, v in identifiers.items():
-                    self.output_box.insert(tk.END, f"  {k}: {v}\n")
-                self.output_box.insert(tk.END, "\n")
+        conditions, generation = self._watch_target
+        if not self.generations.is_current(generation):
+            return
+
+        self.watcher = ChangeWatcher(
+            self.api_client,
+            conditions,
+            on_changes=lambda changed, removed: self._changes_found(changed, removed, generation),
+            interval=self.WATCH_INTERVAL,
+            max_interval=self.WATCH_MAX_INTERVAL
+        ).start(self._results)
+        self.api_client.metrics.add_source("change_watch", self.watcher.stats)
+
+    def _stop_watch(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def _changes_found(self, changed, removed, generation):
+        # Watcher thread: index the raw payloads, hand Tickets to the UI
+        self.search_index.index_tickets(changed)
+        tickets = [Ticket.from_api(t) for t in changed]
+        self._post(generation, lambda: self._apply_changes(tickets, removed, generation))
+
+    def _apply_changes(self, tickets, removed, generation):
+        shown = {t.id for t in self._results}
+        updated = {t.id: t for t in tickets}
+        removed_ids = set(removed)
+
+        # Updated tickets keep their place; new ones go on top
+        self._results = [t for t in reversed(tickets) if t.id not in shown] + [
+            updated.get(t.id, t) for t in self._results if t.id not in removed_ids
+        ]
+
+        self.results.apply_changes(tickets, removed)
+        self._prefetch_descriptions(tickets, generation)
+
+        self.duration_label.config(
+            text=f"Results: {len(self._results)} tickets "
+                 f"({len(tickets)} changed, {len(removed)} removed at {time.strftime('%H:%M:%S')})"
+        )
+
+    def _ticket_row(self, t):
+        return t.id, (t.id, t.summary, t.owner, t.company_label(), t.status, t.board)
 
-            # ---- Full description ----
-            self.output_box.insert(tk.END, f"{description}\n\n")
+    def _description_failed(self, tid, error, generation):
+        warning(f"Failed to fetch notes for ticket {tid}: {error}", ticket_id=tid)
+        self._post(
+            generation,
+            lambda: self.results.set_detail(tid, f"[Description unavailable: {error}]")
+        )
+
+    def _description_loaded(self, tid, description, generation):
+        # Runs on a prefetch worker: extract here, render on the UI thread.
+        # Identifiers are indexed even for superseded searches.
+        identifiers = self.extract_identifiers(description, ticket_id=tid)
+        self._post(generation, lambda: self._render_description(tid, description, identifiers))
+
+    def _render_description(self, tid, description, identifiers):
+        block = ""
+
+        # ---- Identifiers (if present) ----
+        if identifiers:
+            block += "Identifiers:\n"
+            for k, v in identifiers.items():
+                block += f"  {k}: {v}\n"
+            block += "\n"
+
+        # ---- Full description ----
+        block += description
+
+        self.results.set_detail(tid, block)
+
+    def display_text_results(self, results, text, identifier_matches=()):
+        message = f"Text matches for {text}: {len(results)}"
+        if identifier_matches:
+            message += (
+                f"  |  identifier seen in ticket(s): "
+                f"{', '.join(f'#{tid}' for tid in identifier_matches)}"
+            )
+        self.results.set_message(message)
+
+        self.results.append([
+            Ticket(r["id"], summary=r["summary"], company=r["company"],
+                   status=r["status"], board=r["board"])
+            for r in results
+        ])
+        for r in results:
+            self.results.set_detail(r["id"], r["snippet"])
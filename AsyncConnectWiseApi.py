@@ -0,0 +1,234 @@
+import asyncio
+
+import aiohttp
+
+from ConnectWiseApi import ConnectWiseAPIClient, ticket_params, notes_params
+from lookup_cache import LookupCache
+from query import Query
+
+
+class AsyncConnectWiseAPIClient:
+    """
+    asyncio counterpart of ConnectWiseAPIClient.
+
+    All requests share one aiohttp connector, so hundreds of concurrent
+    calls on a single event loop reuse a bounded set of keep-alive
+    connections instead of needing one thread each.
+    """
+
+    MAX_PAGE_SIZE = ConnectWiseAPIClient.MAX_PAGE_SIZE
+
+    def __init__(self, username, password, client_id, company="company", site="na",
+                 pool_size=100, timeout=30, lookup_cache=None, base_url=None):
+        self.base_url = base_url or f"https://api-{site}.myconnectwise.net/v4_6_release/apis/3.0"
+        self.auth = aiohttp.BasicAuth(username, password)
+        self.client_id = client_id
+        self.company_identifier = company
+
+        # Ticket detail flags
+        self.detailDescriptionFlag = False
+        self.internalAnalysisFlag = True
+        self.resolutionFlag = False
+
+        self.headers = {
+            "clientId": self.client_id,
+            "Content-Type": "application/json",
+            "companyIdentifier": self.company_identifier
+        }
+
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+
+        # Company / site id lookups; can be shared with a sync client
+        self.lookup_cache = lookup_cache or LookupCache()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    # ---------------------------------------
+    # TRANSPORT
+    # ---------------------------------------
+    def session(self):
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                auth=self.auth,
+                headers=self.headers,
+                timeout=self.timeout,
+                raise_for_status=True
+            )
+        return self._session
+
+    async def _get_json(self, path, params=None):
+        async with self.session().get(f"{self.base_url}{path}",
+                                      params=_query(params)) as response:
+            return await response.json(content_type=None)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.lookup_cache.flush()
+
+    # ---------------------------------------
+    # COMPANY LOOKUPS
+    # ---------------------------------------
+    async def get_company(self, identifier):
+        key = ("company", identifier.strip().lower())
+
+        cached = self.lookup_cache.get(key)
+        if cached is None:
+            raise ValueError(f"No company found for identifier {identifier}")
+        if cached is not LookupCache.MISSING:
+            return dict(cached)
+
+        params = {"conditions": Query().equals("identifier", identifier).conditions()}
+
+        results = await self._get_json("/company/companies", params=params)
+        if not results:
+            self.lookup_cache.put_missing(key)
+            raise ValueError(f"No company found for identifier {identifier}")
+
+        obj = results[0]
+        company = {"id": obj["id"], "identifier": obj["identifier"], "name": obj["name"]}
+        self.lookup_cache.put(key, company)
+        return company
+
+    async def get_company_site(self, company_id, site_name):
+        key = ("site", company_id, site_name.strip().lower())
+
+        cached = self.lookup_cache.get(key)
+        if cached is None:
+            raise ValueError(f"No site '{site_name}' found for company {company_id}")
+        if cached is not LookupCache.MISSING:
+            return dict(cached)
+
+        params = {"conditions": Query().equals("name", site_name).conditions()}
+
+        results = await self._get_json(f"/company/companies/{company_id}/sites", params=params)
+        if not results:
+            self.lookup_cache.put_missing(key)
+            raise ValueError(f"No site '{site_name}' found for company {company_id}")
+
+        obj = results[0]
+        site = {"id": obj["id"], "name": obj["name"]}
+        self.lookup_cache.put(key, site)
+        return site
+
+    # ---------------------------------------
+    # CREATE TICKET
+    # ---------------------------------------
+    async def create_ticket(self, payload):
+        async with self.session().post(f"{self.base_url}/service/tickets",
+                                       json=payload) as response:
+            return await response.json(content_type=None)
+
+    # ---------------------------------------
+    # GET BOARDS & STATUSES
+    # ---------------------------------------
+    async def get_boards(self):
+        # The default page size (25) would silently drop boards
+        return await self._get_json("/service/boards",
+                                    {"fields": "id,name", "pageSize": self.MAX_PAGE_SIZE})
+
+    async def get_statuses(self, board_id):
+        return await self._get_json(f"/service/boards/{board_id}/statuses",
+                                    {"fields": "id,name", "pageSize": self.MAX_PAGE_SIZE})
+
+    # ---------------------------------------
+    # TICKETS
+    # ---------------------------------------
+    async def get_tickets(self, conditions=None, page=1, page_size=25,
+                          order_by=None, expand=None, fields=None, profile="list"):
+        params = ticket_params(
+            self, conditions, page, page_size,
+            order_by=order_by, expand=expand, fields=fields, profile=profile
+        )
+
+        return await self._get_json("/service/tickets", params=params)
+
+    async def iter_tickets(self, conditions=None, page_size=None, max_results=None,
+                           order_by=None, expand=None, fields=None, prefetch=True,
+                           profile="list"):
+        """
+        Async generator over every page of a ticket search.
+
+        Same contract as ConnectWiseAPIClient.iter_tickets: page N+1 is
+        requested as a background task while page N is being consumed.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        page_size = min(page_size or max_results or 100, self.MAX_PAGE_SIZE)
+        pending = None
+
+        def fetch(page):
+            return self.get_tickets(
+                conditions=conditions,
+                page=page,
+                page_size=page_size,
+                order_by=order_by,
+                expand=expand,
+                fields=fields,
+                profile=profile
+            )
+
+        try:
+            page = 1
+            yielded = 0
+            current = await fetch(page)
+
+            while current:
+                more = len(current) >= page_size and (
+                    max_results is None or yielded + len(current) < max_results
+                )
+                if more and prefetch:
+                    pending = asyncio.ensure_future(fetch(page + 1))
+
+                for ticket in current:
+                    yield ticket
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+
+                if not more:
+                    return
+
+                page += 1
+                current = await pending if pending else await fetch(page)
+                pending = None
+
+        finally:
+            if pending:
+                pending.cancel()
+
+    async def get_ticket_notes(self, ticket_id, detail=True, internal=False, resolution=False):
+        params = notes_params(detail, internal, resolution)
+
+        return await self._get_json(f"/service/tickets/{ticket_id}/notes", params=params)
+
+    async def get_initial_description(self, ticket_id):
+        notes = await self.get_ticket_notes(ticket_id, detail=True)
+
+        for note in notes:
+            if note.get("detailDescriptionFlag"):
+                return note.get("text")
+
+        return None
+
+
+def _query(params):
+    # aiohttp only accepts str/int/float values; send booleans the way
+    # requests does ("True"/"False") so both clients hit the same URLs.
+    if not params:
+        return None
+    return {k: str(v) if isinstance(v, bool) else v for k, v in params.items()}
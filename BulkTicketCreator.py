@@ -0,0 +1,256 @@
+# BulkTicketCreator.py
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+
+from query import Query
+from singleflight import SingleFlight
+from timer import Timer
+from log import log, warning
+
+
+class OutcomeUnknownError(RuntimeError):
+    """A POST may or may not have created its ticket, and we could not find out."""
+
+
+def idempotency_key(payload):
+    """
+    Stable key for a ticket payload. An explicit externalXRef wins;
+    otherwise it is a hash of the payload as given (before company/site
+    resolution), so re-running the same input yields the same keys.
+    """
+    if payload.get("externalXRef"):
+        return str(payload["externalXRef"])
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return "rs-" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class IdempotencyLedger:
+    """
+    Idempotency key -> created ticket id, optionally persisted as an
+    append-only JSON-lines file so a re-run after a crash skips every
+    ticket that was already created.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue    # torn last line after a crash
+                    self._entries[row["key"]] = row["ticket_id"]
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def record(self, key, ticket_id):
+        with self._lock:
+            self._entries[key] = ticket_id
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "ticket_id": ticket_id}) + "\n")
+
+
+class BulkTicketCreator:
+    """
+    Creates many tickets concurrently.
+
+    Payloads may name their company by identifier ({"identifier": ...})
+    and site by name ({"name": ...}); each distinct value is resolved to
+    an id once per run. Every payload carries an idempotency key in
+    externalXRef: keys already in the ledger (or seen earlier in the same
+    run) are not posted again, and when a POST fails without a clear
+    answer (timeout, 5xx) the server is asked whether the ticket exists
+    before it is retried: up to `checks` times, after jittered delays
+    growing from `check_delay` seconds, since the first POST may still be
+    committing. If that check fails too, the item is reported as "unknown"
+    and never posted again. Requests go through the client's
+    scheduler, so its rate limits apply.
+    """
+
+    def __init__(self, api_client, max_workers=8, ledger=None, retries=2,
+                 checks=3, check_delay=1.0):
+        self.api = api_client
+        self.max_workers = max_workers
+        self.ledger = ledger or IdempotencyLedger()
+        self.retries = retries
+        self.checks = checks
+        self.check_delay = check_delay
+
+        self._resolved = {}     # ("company"|"site", ...) -> id or ValueError
+        self._resolving = SingleFlight()
+
+    def create(self, payloads, on_result=None):
+        """
+        Args:
+            payloads (iterable): ticket payloads; consumed lazily, so a
+                                 generator over a large file works
+            on_result (callable): on_result(item) as each item finishes
+                                  (called on worker threads)
+
+        Returns:
+            (report, stats): one item per payload in input order with
+            index, key, status ("created", "existing", "duplicate",
+            "unknown", "failed"), ticket_id, error and ms; stats holds per-status
+            counts and the wall time.
+        """
+        report = {}
+        seen = {}               # key -> index of first occurrence this run
+        window = self.max_workers * 2
+        pending = set()
+
+        def finish(item):
+            report[item["index"]] = item
+            if on_result:
+                on_result(item)
+
+        with Timer() as wall, ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="bulk-create"
+        ) as executor:
+            for index, payload in enumerate(payloads):
+                key = idempotency_key(payload)
+
+                if key in seen:
+                    finish(_item(index, key, "duplicate", error=f"same key as item {seen[key]}"))
+                    continue
+                seen[key] = index
+
+                if (existing := self.ledger.get(key)) is not None:
+                    finish(_item(index, key, "existing", ticket_id=existing))
+                    continue
+
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future.result())
+
+                pending.add(executor.submit(self._create_one, index, key, payload))
+
+            for future in pending:
+                finish(future.result())
+
+        items = [report[i] for i in sorted(report)]
+        stats = {"total": len(items), "wall_ms": wall.ms()}
+        for item in items:
+            stats[item["status"]] = stats.get(item["status"], 0) + 1
+
+        log(f"Bulk create finished: {stats}")
+        return items, stats
+
+    # ---------------------------------------
+    # PER ITEM
+    # ---------------------------------------
+    def _create_one(self, index, key, payload):
+        with Timer() as t:
+            try:
+                body = self._resolve(dict(payload))
+                body["externalXRef"] = key
+                ticket_id = self._post(key, body)
+            except OutcomeUnknownError as e:
+                status, ticket_id, error = "unknown", None, str(e)
+            except Exception as e:
+                status, ticket_id, error = "failed", None, str(e)
+            else:
+                status, error = "created", None
+                self.ledger.record(key, ticket_id)
+
+        if error:
+            warning(f"Bulk create item {index} failed: {error}", key=key)
+        return _item(index, key, status, ticket_id, error, t.ms())
+
+    def _post(self, key, body):
+        attempt = 0
+        while True:
+            try:
+                return self.api.create_ticket(body)["id"]
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code < 500:
+                    raise   # rejected outright; nothing was created
+
+                # The ticket may exist even though we never saw the reply
+                existing = self._await_existing(key)
+                if existing is not None:
+                    return existing
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+
+    def _await_existing(self, key):
+        # Only "still absent after every check" lets the POST be retried
+        for check in range(self.checks):
+            time.sleep(random.uniform(0.5, 1.0) * self.check_delay * (2 ** check))
+            existing = self._find_existing(key)
+            if existing is not None:
+                return existing
+        return None
+
+    def _find_existing(self, key):
+        # A failed lookup is not "not found": re-posting could duplicate
+        try:
+            found = self.api.get_tickets(
+                conditions=Query().equals("externalXRef", key), page_size=1, fields="id"
+            )
+        except Exception as e:
+            raise OutcomeUnknownError(
+                f"POST failed and the existence check failed too ({e}); not re-posted"
+            ) from e
+        return found[0]["id"] if found else None
+
+    # ---------------------------------------
+    # COMPANY / SITE RESOLUTION
+    # ---------------------------------------
+    def _resolve(self, payload):
+        company = payload.get("company")
+        if isinstance(company, dict) and "id" not in company and company.get("identifier"):
+            ident = company["identifier"]
+            company_id = self._lookup(("company", ident.strip().lower()),
+                                      lambda: self.api.get_company(ident)["id"])
+            payload["company"] = {"id": company_id}
+
+        site = payload.get("site")
+        if isinstance(site, dict) and "id" not in site and site.get("name"):
+            company_id = (payload.get("company") or {}).get("id")
+            if company_id is None:
+                raise ValueError(f"Site '{site['name']}' given without a company")
+            name = site["name"]
+            site_id = self._lookup(("site", company_id, name.strip().lower()),
+                                   lambda: self.api.get_company_site(company_id, name)["id"])
+            payload["site"] = {"id": site_id}
+
+        return payload
+
+    def _lookup(self, key, fetch):
+        # One fetch per distinct value (failures included); workers that
+        # need the same value meanwhile wait for that fetch
+        def resolve():
+            if key not in self._resolved:
+                try:
+                    self._resolved[key] = fetch()
+                except ValueError as e:
+                    self._resolved[key] = e
+            return self._resolved[key]
+
+        value = self._resolved[key] if key in self._resolved else self._resolving.do(key, resolve)
+
+        if isinstance(value, ValueError):
+            raise value
+        return value
+
+
+def _item(index, key, status, ticket_id=None, error=None, ms=0.0):
+    return {"index": index, "key": key, "status": status,
+            "ticket_id": ticket_id, "error": error, "ms": ms}
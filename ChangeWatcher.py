@@ -0,0 +1,215 @@
+# ChangeWatcher.py
+import threading
+
+from TicketStore import last_updated
+from log import log, warning
+from query import Query
+from timer import Timer
+
+# Just enough to tell whether a ticket changed
+_VERSION_FIELDS = "id,_info/lastUpdated"
+
+
+class ChangeWatcher:
+    """
+    Polls for tickets changed since the last poll and reports the deltas
+    for one search filter.
+
+    Each poll asks only for tickets updated at or after the watermark:
+    those matching the filter are added or updated, and shown tickets that
+    changed but no longer match it are removed (checked with an
+    `id in (...)` query over the shown ids). Requests go through the
+    client, so they share its rate limits with everything else.
+
+    The boundary uses >= like TicketSync, so a ticket updated in the same
+    second as the watermark is not missed; tickets whose lastUpdated did
+    not move are ignored, so the boundary ticket is not reported again.
+    Polls that find nothing stretch the delay by `backoff` up to
+    `max_interval`; any change drops it back to `interval`.
+
+        watcher = ChangeWatcher(api, conditions, on_changes)
+        watcher.start(shown_tickets)    # Tickets or API payloads
+        ...
+        watcher.stop()
+
+    on_changes(changed, removed_ids) is called from the watcher thread
+    with the changed API payloads.
+    """
+
+    ID_CHUNK = 100      # ids per removal-check query
+
+    def __init__(self, api, conditions, on_changes, interval=30, max_interval=300,
+                 backoff=2.0, page_size=100):
+        self.api = api
+        self.conditions = conditions
+        self.on_changes = on_changes
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.page_size = page_size
+
+        self.watermark = None
+        self.delay = interval
+        self._versions = {}     # id -> lastUpdated of every shown ticket
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.polls = 0
+        self.empty_polls = 0
+        self.errors = 0
+        self.changes = 0
+
+    # ---------------------------------------
+    # LIFECYCLE
+    # ---------------------------------------
+    def seed(self, tickets):
+        """Records the shown tickets and starts the watermark at the newest."""
+        for t in tickets:
+            tid, updated = _version(t)
+            self._versions[tid] = updated
+
+        self.watermark = max((v for v in self._versions.values() if v), default=None)
+        return self
+
+    def start(self, tickets=()):
+        self.seed(tickets)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="change-watch")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def stats(self):
+        return {
+            "polls": self.polls,
+            "empty_polls": self.empty_polls,
+            "errors": self.errors,
+            "changes": self.changes,
+            "delay_s": self.delay,
+            "watched": len(self._versions),
+        }
+
+    def _run(self):
+        # Nothing shown: start from the newest matching ticket, not the
+        # beginning. Retried every tick until it works; polling without a
+        # watermark would report every matching ticket as added.
+        seeded = self.watermark is not None or self._seed_from_server()
+
+        while not self._stop.wait(self.delay):
+            if not seeded:
+                seeded = self._seed_from_server()
+                found = False
+            else:
+                try:
+                    found = self.poll()
+                except Exception as e:
+                    self.errors += 1
+                    warning(f"Change watch poll failed: {e}")
+                    found = False
+
+            if found:
+                self.delay = self.interval
+            else:
+                self.delay = min(self.delay * self.backoff, self.max_interval)
+
+    def _seed_from_server(self):
+        try:
+            self.watermark = self._newest_update()
+        except Exception as e:
+            self.errors += 1
+            warning(f"Change watch could not start: {e}")
+            return False
+        return True
+
+    # ---------------------------------------
+    # POLLING
+    # ---------------------------------------
+    def poll(self):
+        """
+        One round trip (plus removal checks). Calls on_changes and
+        returns True when anything was added, updated or removed.
+        """
+        self.polls += 1
+
+        # Every query in this poll uses the same watermark; it only moves
+        # once all of them have answered
+        since = self.watermark
+        seen = []
+
+        with Timer() as t:
+            changed = [
+                ticket for ticket in self._changed(since, self.conditions, seen)
+                if self._versions.get(ticket["id"]) != last_updated(ticket)
+            ]
+            removed = self._removed(since, {ticket["id"] for ticket in changed}, seen)
+
+        # Superseded while the requests were in flight
+        if self._stop.is_set():
+            return False
+
+        for ticket in changed:
+            self._versions[ticket["id"]] = last_updated(ticket)
+        for tid in removed:
+            self._versions.pop(tid, None)
+        for updated in seen:
+            self._advance(updated)
+
+        if not changed and not removed:
+            self.empty_polls += 1
+            return False
+
+        self.changes += len(changed) + len(removed)
+        log(f"Change watch: {len(changed)} changed, {len(removed)} removed", latency_ms=t.ms())
+        self.on_changes(changed, removed)
+        return True
+
+    def _changed(self, since, conditions, seen, fields=None):
+        # `seen` collects every lastUpdated returned, for the next watermark
+        for ticket in self.api.iter_tickets(
+            conditions=Query().updated_since(since).raw(conditions),
+            page_size=self.page_size,
+            order_by="lastUpdated asc",
+            fields=fields
+        ):
+            seen.append(last_updated(ticket))
+            yield ticket
+
+    def _removed(self, since, still_matching, seen):
+        """Shown tickets that changed since `since` but left the filter."""
+        if not self.conditions:
+            return []
+
+        ids = [tid for tid in self._versions if tid not in still_matching]
+        removed = []
+
+        for i in range(0, len(ids), self.ID_CHUNK):
+            chunk = Query().one_of("id", ids[i:i + self.ID_CHUNK])
+            for ticket in self._changed(since, chunk, seen, fields=_VERSION_FIELDS):
+                if self._versions.get(ticket["id"]) != last_updated(ticket):
+                    removed.append(ticket["id"])
+
+        return removed
+
+    def _newest_update(self):
+        newest = self.api.get_tickets(
+            conditions=self.conditions,
+            page_size=1,
+            order_by="lastUpdated desc",
+            fields=_VERSION_FIELDS
+        )
+        return last_updated(newest[0]) if newest else None
+
+    def _advance(self, updated):
+        if updated and (self.watermark is None or updated > self.watermark):
+            self.watermark = updated
+
+
+def _version(ticket):
+    if isinstance(ticket, dict):
+        return ticket.get("id"), last_updated(ticket)
+    return ticket.id, ticket.last_updated
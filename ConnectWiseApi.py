@@ -1,12 +1,32 @@
-import requests
+import contextlib
 import json
-from log import log
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from log import log, debug, warning, is_enabled, payloads_enabled, new_request_id
+from timer import Timer
+from transport import HttpTransport
+from lookup_cache import LookupCache
+from result_cache import ResultCache, normalize_key, page_signature
+from projections import get_projection
+from scheduler import RequestScheduler
+from singleflight import SingleFlight
+from metrics import MetricsRegistry
+from json_stream import iter_json_array
+from query import Query
 
 
 class ConnectWiseAPIClient:
 
-    def __init__(self, username, password, client_id, company="company", site="na"):
-        self.base_url = f"https://api-{site}.myconnectwise.net/v4_6_release/apis/3.0"
+    # ConnectWise rejects pageSize values above this
+    MAX_PAGE_SIZE = 1000
+
+    def __init__(self, username, password, client_id, company="company", site="na",
+                 pool_size=16, timeout=(5, 30), lookup_cache=None, result_cache=None,
+                 scheduler=None, metrics=None, base_url=None):
+        # base_url overrides the site URL, e.g. to point at mock_server.py
+        self.base_url = base_url or f"https://api-{site}.myconnectwise.net/v4_6_release/apis/3.0"
         self.auth = (username, password)
         self.client_id = client_id
         self.company_identifier = company
@@ -22,66 +42,226 @@ class ConnectWiseAPIClient:
             "companyIdentifier": self.company_identifier
         }
 
+        # Shared keep-alive connection pool for every endpoint method
+        self.transport = HttpTransport(
+            auth=self.auth,
+            headers=self.headers,
+            pool_maxsize=pool_size,
+            timeout=timeout
+        )
+
+        # Rate limits, retries and circuit breaking; the site bucket is
+        # shared with every other client for the same site
+        self.scheduler = scheduler or RequestScheduler(site)
+
+        # Identical GETs in flight at the same time share one round trip
+        self.inflight = SingleFlight()
+
+        # Company / site id lookups (pass LookupCache(path=...) to persist)
+        self.lookup_cache = lookup_cache or LookupCache()
+
+        # Ticket pages served stale-while-revalidate (get_tickets use_cache=True)
+        self.result_cache = result_cache or ResultCache()
+        self._revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="revalidate")
+
+        # Heavy per-ticket fields, fetched only when a ticket is opened
+        self.detail_cache = LookupCache(max_entries=256, ttl=300, negative_ttl=0)
+
+        # Response bytes per projection profile
+        self._payload_stats = {}
+        self._stats_lock = threading.Lock()
+
+        # Per-endpoint latency / status / bytes / retries, plus cache counters
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics.add_source("lookup_cache", self.lookup_cache.stats)
+        self.metrics.add_source("result_cache", self.result_cache.stats)
+        self.metrics.add_source("detail_cache", self.detail_cache.stats)
+        self.metrics.add_source("coalescing", self.inflight.stats)
+        self.metrics.add_source("pool", self.pool_stats)
+
+    # ---------------------------------------
+    # TRANSPORT
+    # ---------------------------------------
+    def _request(self, method, path, **kwargs):
+        url = f"{self.base_url}{path}"
+
+        def send():
+            return self.transport.request(method, url, **kwargs)
+
+        retries = [0]
+
+        def on_retry():
+            retries[0] += 1
+
+        # Latency covers retries and the body download (for streamed
+        # responses only up to the headers; their bytes are added as they
+        # are read); server_ms separates API time from transfer time
+        streamed = kwargs.get("stream", False)
+        try:
+            with Timer() as t:
+                response = self.scheduler.execute(method, send, on_retry=on_retry)
+        except Exception:
+            self.metrics.record_request(method, path, "error", t.ms(), retries=retries[0])
+            raise
+
+        self.metrics.record_request(
+            method, path, response.status_code, t.ms(),
+            server_ms=response.elapsed.total_seconds() * 1000,
+            size=0 if streamed else len(response.content),
+            retries=retries[0]
+        )
+
+        if is_enabled("DEBUG"):
+            debug(f"{method} {path} -> {response.status_code}",
+                  request_id=new_request_id(), latency_ms=t.ms(),
+                  status=response.status_code, retries=retries[0])
+        return response
+
+    def _get_json(self, path, params=None, profile=None):
+        # Each caller decodes the shared response itself, so nobody sees
+        # another caller's mutations of the parsed JSON.
+        key = (path, _params_key(params))
+        response = self.inflight.do(key, lambda: self._request("GET", path, params=params))
+        response.raise_for_status()
+
+        if profile:
+            self._record_payload(profile, len(response.content))
+
+        return response.json()
+
+    def _stream_json(self, path, params=None, profile=None, chunk_size=65536):
+        """
+        Yields the elements of a JSON array response while it downloads,
+        instead of buffering and decoding the whole body first.
+        """
+        response = self._request("GET", path, params=params, stream=True)
+        received = [0]
+
+        def chunks():
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                received[0] += len(chunk)
+                yield chunk
+
+        try:
+            response.raise_for_status()
+            yield from iter_json_array(chunks())
+        finally:
+            # Returns the connection to the pool even if the caller stops early
+            response.close()
+            self.metrics.record_bytes("GET", path, received[0])
+            if profile:
+                self._record_payload(profile, received[0])
+
+    def _record_payload(self, profile, size):
+        with self._stats_lock:
+            stats = self._payload_stats.setdefault(profile, {"requests": 0, "bytes": 0})
+            stats["requests"] += 1
+            stats["bytes"] += size
+
+    def payload_stats(self):
+        """
+        Decoded response bytes per projection profile; requests whose
+        fields/expand were given explicitly are counted as "custom".
+        """
+        with self._stats_lock:
+            return {
+                profile: dict(s, avg_bytes=round(s["bytes"] / s["requests"]))
+                for profile, s in self._payload_stats.items()
+            }
+
+    def pool_stats(self):
+        """Connections opened vs. reused by the shared transport."""
+        return self.transport.pool_stats()
+
+    def coalescing_stats(self):
+        """GETs actually sent vs. answered by an identical in-flight one."""
+        return self.inflight.stats()
+
+    def scheduler_state(self):
+        """Token buckets, circuit breaker and retry counters."""
+        return self.scheduler.state()
+
+    def close(self):
+        self.transport.close()
+        self.lookup_cache.flush()
+
     # ---------------------------------------
     # COMPANY LOOKUPS
     # ---------------------------------------
     def get_company(self, identifier):
-        url = f"{self.base_url}/company/companies"
-        params = {"conditions": f"identifier='{identifier}'"}
+        key = ("company", identifier.strip().lower())
 
-        response = requests.get(url, headers=self.headers, auth=self.auth, params=params)
-        response.raise_for_status()
+        cached = self.lookup_cache.get(key)
+        if cached is None:
+            raise ValueError(f"No company found for identifier {identifier}")
+        if cached is not LookupCache.MISSING:
+            return dict(cached)
 
-        results = response.json()
+        params = {"conditions": Query().equals("identifier", identifier).conditions()}
+
+        results = self._get_json("/company/companies", params=params)
         if not results:
+            self.lookup_cache.put_missing(key)
             raise ValueError(f"No company found for identifier {identifier}")
 
         obj = results[0]
-        return {"id": obj["id"], "identifier": obj["identifier"], "name": obj["name"]}
+        company = {"id": obj["id"], "identifier": obj["identifier"], "name": obj["name"]}
+        self.lookup_cache.put(key, company)
+        return company
 
     def get_company_site(self, company_id, site_name):
-        url = f"{self.base_url}/company/companies/{company_id}/sites"
-        params = {"conditions": f"name='{site_name}'"}
+        key = ("site", company_id, site_name.strip().lower())
 
-        response = requests.get(url, headers=self.headers, auth=self.auth, params=params)
-        response.raise_for_status()
+        cached = self.lookup_cache.get(key)
+        if cached is None:
+            raise ValueError(f"No site '{site_name}' found for company {company_id}")
+        if cached is not LookupCache.MISSING:
+            return dict(cached)
 
-        results = response.json()
+        params = {"conditions": Query().equals("name", site_name).conditions()}
+
+        results = self._get_json(f"/company/companies/{company_id}/sites", params=params)
         if not results:
+            self.lookup_cache.put_missing(key)
             raise ValueError(f"No site '{site_name}' found for company {company_id}")
 
         obj = results[0]
-        return {"id": obj["id"], "name": obj["name"]}
+        site = {"id": obj["id"], "name": obj["name"]}
+        self.lookup_cache.put(key, site)
+        return site
 
     # ---------------------------------------
     # CREATE TICKET
     # ---------------------------------------
     def create_ticket(self, payload):
-        url = f"{self.base_url}/service/tickets"
-        response = requests.post(url, json=payload, auth=self.auth, headers=self.headers)
+        response = self._request("POST", "/service/tickets", json=payload)
         response.raise_for_status()
+
+        # Any cached search may now be missing the new ticket
+        self.result_cache.invalidate()
         return response.json()
 
     # ---------------------------------------
     # GET BOARDS & STATUSES
     # ---------------------------------------
     def get_boards(self):
-        url = f"{self.base_url}/service/boards"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
-        response.raise_for_status()
-        return response.json()
+        # The default page size (25) would silently drop boards
+        return self._get_json("/service/boards",
+                              {"fields": "id,name", "pageSize": self.MAX_PAGE_SIZE})
 
     def get_statuses(self, board_id):
-        url = f"{self.base_url}/service/boards/{board_id}/statuses"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
-        response.raise_for_status()
-        return response.json()
+        return self._get_json(f"/service/boards/{board_id}/statuses",
+                              {"fields": "id,name", "pageSize": self.MAX_PAGE_SIZE})
 
     # ---------------------------------------
     # DEBUG: FULL TICKET FETCH
     # ---------------------------------------
     def debug_get_full_ticket(self, ticket_id):
-        url = f"{self.base_url}/service/tickets/{ticket_id}"
+        # Costs a full request plus a pretty-printed dump; only when asked for
+        if not payloads_enabled():
+            return
+
+        path = f"/service/tickets/{ticket_id}"
         params = {
             "expand": "owner,company,board,notes,contact,team,documents",
             "fields": (
@@ -93,10 +273,10 @@ class ConnectWiseAPIClient:
         }
 
         log("===== DEBUG FULL TICKET REQUEST =====")
-        log(f"URL: {url}")
+        log(f"URL: {self.base_url}{path}")
         log(f"PARAMS: {params}")
 
-        r = requests.get(url, headers=self.headers, auth=self.auth, params=params)
+        r = self._request("GET", path, params=params)
 
         log(f"STATUS: {r.status_code}")
 
@@ -112,18 +292,11 @@ class ConnectWiseAPIClient:
     # ---------------------------------------
     def get_tickets_by_company(self, company_identifier, extra_conditions=None,
                                page=1, page_size=25, order_by=None):
-
-        company = self.get_company(company_identifier)
-        company_id = company["id"]
-
-        base_condition = f"company/id={company_id}"
-        if extra_conditions:
-            full_cond = f"{base_condition} AND ({extra_conditions})"
-        else:
-            full_cond = base_condition
+        # Filtered by identifier server-side; no company lookup needed
+        query = Query().company(company_identifier).raw(extra_conditions)
 
         return self.get_tickets(
-            conditions=full_cond,
+            conditions=query,
             page=page,
             page_size=page_size,
             order_by=order_by
@@ -134,62 +307,317 @@ class ConnectWiseAPIClient:
     # ---------------------------------------
     def get_tickets(self, conditions=None, page=1, page_size=25,
                     order_by=None, expand=None, fields=None,
-                    full_response=False):
+                    full_response=False, use_cache=False, on_update=None,
+                    profile="list"):
+        """
+        Fetches one page of tickets.
+
+        `profile` picks the fields/expand projection ("list", "detail",
+        "export"); explicit `fields`/`expand` override it.
+
+        With `use_cache`, a previously fetched identical page is returned
+        immediately and revalidated in the background; if the server's
+        page differs, the cache is replaced and `on_update(fresh_tickets)`
+        is called from the revalidation thread.
+        """
+        params = ticket_params(
+            self, conditions, page, page_size,
+            order_by=order_by, expand=expand, fields=fields, profile=profile
+        )
 
-        url = f"{self.base_url}/service/tickets"
+        label = payload_label(profile, fields, expand)
 
-        params = {
-            "page": page,
-            "pageSize": page_size,
-            "orderBy": order_by or "lastUpdated DESC",
-            "expand": expand or "owner,company,board,notes",
-            "fields": fields or (
-                "id,summary,description,initialDescription,internalAnalysis,resolution,"
-                "notes,owner/identifier,status/name,board/name,company/name,company/identifier"
-            ),
+        if not use_cache:
+            return self._get_json("/service/tickets", params=params, profile=label)
 
-            # Add the new flags
-            "detailDescriptionFlag": self.detailDescriptionFlag,
-            "internalAnalysisFlag": self.internalAnalysisFlag,
-            "resolutionFlag": self.resolutionFlag,
-        }
+        key = normalize_key(params)
+        cached = self.result_cache.get(key)
 
-        if conditions:
-            params["conditions"] = conditions
+        if cached is ResultCache.MISSING:
+            tickets = self._get_json("/service/tickets", params=params, profile=label)
+            self.result_cache.put(key, tickets)
+            return list(tickets)
 
-        response = requests.get(
-            url,
-            headers=self.headers,
-            auth=self.auth,
-            params=params
+        if self.result_cache.begin_revalidation(key):
+            self._revalidator.submit(self._revalidate, key, params, cached, on_update)
+
+        return list(cached)
+
+    def stream_tickets(self, conditions=None, page=1, page_size=25,
+                       order_by=None, expand=None, fields=None, use_cache=False,
+                       on_update=None, profile="list"):
+        """
+        Like get_tickets, but a generator that yields each ticket as soon
+        as it has been decoded from the response, so a large page (e.g.
+        with expand=notes) is never held in memory as a whole.
+
+        With `use_cache`, a cached page is replayed (and revalidated as in
+        get_tickets); on a miss the streamed page is collected and cached
+        once it has been read completely.
+        """
+        params = ticket_params(
+            self, conditions, page, page_size,
+            order_by=order_by, expand=expand, fields=fields, profile=profile
         )
 
-        response.raise_for_status()
-        return response.json()
+        if use_cache:
+            key = normalize_key(params)
+            cached = self.result_cache.get(key)
+            if cached is not ResultCache.MISSING:
+                if self.result_cache.begin_revalidation(key):
+                    self._revalidator.submit(self._revalidate, key, params, cached, on_update)
+                yield from list(cached)
+                return
+
+        stream = self._stream_json("/service/tickets", params=params,
+                                   profile=payload_label(profile, fields, expand))
+        if not use_cache:
+            yield from stream
+            return
+
+        # One ticket of lookahead: the page is cached as soon as the array
+        # has been read to its end, before the last ticket is handed out,
+        # so a caller that stops right after it (max_results) still fills
+        # the cache. A page abandoned earlier is never cached.
+        collected = []
+        with contextlib.closing(stream):
+            for ticket in stream:
+                if collected:
+                    yield collected[-1]
+                collected.append(ticket)
+
+        self.result_cache.put(key, collected)
+        if collected:
+            yield collected[-1]
+
+    def _revalidate(self, key, params, cached, on_update):
+        updated = False
+        try:
+            # Cheap probe first: ids + lastUpdated only
+            probe = dict(params, fields="id,_info/lastUpdated")
+            probe.pop("expand", None)
+            current = self._get_json("/service/tickets", params=probe)
+
+            if page_signature(current) == page_signature(cached):
+                self.result_cache.touch(key)
+                return
+
+            fresh = self._get_json("/service/tickets", params=params)
+            self.result_cache.put(key, fresh)
+            updated = True
+
+            if on_update:
+                on_update(list(fresh))
+
+        except Exception as e:
+            warning(f"Revalidation failed for {key}: {e}")
+
+        finally:
+            self.result_cache.end_revalidation(key, updated)
+
+    def iter_tickets(self, conditions=None, page_size=None, max_results=None,
+                     order_by=None, expand=None, fields=None, prefetch=True,
+                     use_cache=False, on_update=None, profile="list", stream=False):
+        """
+        Lazily walks every page of a ticket search, yielding tickets one by one.
+
+        While the caller consumes page N, page N+1 is already being fetched
+        in the background. Iteration stops after `max_results` tickets or
+        at the first short page. Without an explicit `page_size`, a
+        `max_results` that fits in one page is fetched in one request.
+
+        `use_cache` serves pages from the result cache (see get_tickets);
+        revalidated pages are reported as on_update(page, fresh_tickets).
+
+        With `stream`, each page is decoded incrementally (see
+        stream_tickets) so the first ticket arrives before the page has
+        finished downloading; pages are then requested one after another
+        rather than prefetched.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        page_size = min(page_size or max_results or 100, self.MAX_PAGE_SIZE)
+
+        if stream:
+            yield from self._iter_streamed(
+                conditions, page_size, max_results, order_by, expand, fields,
+                use_cache, on_update, profile
+            )
+            return
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+
+        def fetch(page):
+            return self.get_tickets(
+                conditions=conditions,
+                page=page,
+                page_size=page_size,
+                order_by=order_by,
+                expand=expand,
+                fields=fields,
+                profile=profile,
+                use_cache=use_cache,
+                on_update=(lambda fresh: on_update(page, fresh)) if on_update else None
+            )
+
+        try:
+            page = 1
+            yielded = 0
+            current = fetch(page)
+
+            while current:
+                more = len(current) >= page_size and (
+                    max_results is None or yielded + len(current) < max_results
+                )
+                if more and executor:
+                    pending = executor.submit(fetch, page + 1)
+
+                for ticket in current:
+                    yield ticket
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+
+                if not more:
+                    return
+
+                page += 1
+                current = pending.result() if pending else fetch(page)
+                pending = None
+
+        finally:
+            if pending:
+                pending.cancel()
+            if executor:
+                executor.shutdown(wait=False)
+
+    def _iter_streamed(self, conditions, page_size, max_results, order_by, expand,
+                       fields, use_cache, on_update, profile):
+        page = 1
+        yielded = 0
+
+        while True:
+            in_page = 0
+            tickets = self.stream_tickets(
+                conditions=conditions,
+                page=page,
+                page_size=page_size,
+                order_by=order_by,
+                expand=expand,
+                fields=fields,
+                use_cache=use_cache,
+                on_update=(lambda fresh, page=page: on_update(page, fresh)) if on_update else None,
+                profile=profile
+            )
+
+            with contextlib.closing(tickets):
+                for ticket in tickets:
+                    yield ticket
+                    in_page += 1
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+
+            if in_page < page_size:
+                return
+            page += 1
+
+    # ---------------------------------------
+    # LAZY DETAIL
+    # ---------------------------------------
+    def get_ticket_detail(self, ticket_id, profile="detail"):
+        """
+        Heavy fields (description, analysis, resolution, notes) for one
+        ticket, fetched on first open/export and cached for a few minutes.
+        """
+        key = ("ticket", ticket_id, profile)
+
+        cached = self.detail_cache.get(key)
+        if cached is not LookupCache.MISSING and cached is not None:
+            return dict(cached)
+
+        projection = get_projection(profile)
+        params = {"fields": projection.fields}
+        if projection.expand:
+            params["expand"] = projection.expand
+
+        ticket = self._get_json(f"/service/tickets/{ticket_id}", params=params, profile=profile)
+        self.detail_cache.put(key, ticket)
+        return dict(ticket)
+
+    # ---------------------------------------
+    # BULK FETCH
+    # ---------------------------------------
+    def get_ticket_count(self, conditions=None):
+        params = {"conditions": str(conditions)} if conditions else None
+        return self._get_json("/service/tickets/count", params=params).get("count", 0)
+
+    def bulk_get_tickets(self, conditions=None, order_by=None, page_size=MAX_PAGE_SIZE,
+                         max_workers=4, expand=None, fields=None, profile="export"):
+        """
+        Fetches every ticket matching `conditions` with parallel page requests.
+
+        Asks the count endpoint how many tickets match, requests all pages
+        at once (at most `max_workers` in flight) and stitches them back
+        together in page order, so the result keeps the requested orderBy.
+
+        Returns:
+            (tickets, stats) where stats holds the total count, page count,
+            wall time and per-page latencies in milliseconds.
+        """
+        page_size = min(page_size, self.MAX_PAGE_SIZE)
+
+        def fetch(page):
+            with Timer() as t:
+                rows = self.get_tickets(
+                    conditions=conditions,
+                    page=page,
+                    page_size=page_size,
+                    order_by=order_by,
+                    expand=expand,
+                    fields=fields,
+                    profile=profile
+                )
+            return rows, t.ms()
+
+        with Timer() as wall:
+            total = self.get_ticket_count(conditions)
+            pages = math.ceil(total / page_size)
+
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, pages or 1))) as executor:
+                results = list(executor.map(fetch, range(1, pages + 1)))
+
+        # Tickets can shift between pages while they are being fetched;
+        # keep the first occurrence so nothing is returned twice.
+        tickets = []
+        seen = set()
+        for rows, _ in results:
+            for ticket in rows:
+                if ticket.get("id") not in seen:
+                    seen.add(ticket.get("id"))
+                    tickets.append(ticket)
+
+        page_ms = [ms for _, ms in results]
+        ordered = sorted(page_ms)
+        stats = {
+            "count": total,
+            "pages": pages,
+            "wall_ms": wall.ms(),
+            "page_ms": page_ms,
+            "p50_ms": ordered[len(ordered) // 2] if ordered else 0,
+            "max_ms": ordered[-1] if ordered else 0,
+        }
+
+        return tickets, stats
 
     def get_ticket_notes(self, ticket_id,
                          detail=True,
                          internal=False,
                          resolution=False):
 
-        url = f"{self.base_url}/service/tickets/{ticket_id}/notes"
+        params = notes_params(detail, internal, resolution)
 
-        params = {
-            "detailDescriptionFlag": detail,
-            "internalAnalysisFlag": internal,
-            "resolutionFlag": resolution,
-            "orderBy": "dateCreated asc"
-        }
-
-        response = requests.get(
-            url,
-            headers=self.headers,
-            auth=self.auth,
-            params=params
-        )
-
-        response.raise_for_status()
-        return response.json()
+        return self._get_json(f"/service/tickets/{ticket_id}/notes", params=params)
 
     def get_initial_description(self, ticket_id):
         notes = self.get_ticket_notes(ticket_id, detail=True)
@@ -201,3 +629,51 @@ class ConnectWiseAPIClient:
         return None
 
 
+# ---------------------------------------
+# REQUEST PARAMETERS
+# (shared with AsyncConnectWiseAPIClient)
+# ---------------------------------------
+def _params_key(params):
+    if not params:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+
+
+def payload_label(profile, fields=None, expand=None):
+    # Explicit fields/expand override the profile, so its size says nothing about it
+    return "custom" if fields or expand else profile
+
+
+def ticket_params(client, conditions=None, page=1, page_size=25,
+                  order_by=None, expand=None, fields=None, profile="list"):
+    projection = get_projection(profile)
+
+    params = {
+        "page": page,
+        "pageSize": page_size,
+        "orderBy": order_by or "lastUpdated DESC",
+        "fields": fields or projection.fields,
+
+        # Add the new flags
+        "detailDescriptionFlag": client.detailDescriptionFlag,
+        "internalAnalysisFlag": client.internalAnalysisFlag,
+        "resolutionFlag": client.resolutionFlag,
+    }
+
+    if expand or projection.expand:
+        params["expand"] = expand or projection.expand
+
+    # Accepts a Query or a plain conditions string
+    if conditions:
+        params["conditions"] = str(conditions)
+
+    return params
+
+
+def notes_params(detail=True, internal=False, resolution=False):
+    return {
+        "detailDescriptionFlag": detail,
+        "internalAnalysisFlag": internal,
+        "resolutionFlag": resolution,
+        "orderBy": "dateCreated asc"
+    }
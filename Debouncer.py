@@ -0,0 +1,29 @@
+# Debouncer.py
+
+
+class Debouncer:
+    """
+    Runs `callback` once input has paused for `delay_ms`.
+
+    Every trigger() reschedules the pending after() call, so a burst of
+    keystrokes results in a single search.
+    """
+
+    def __init__(self, widget, callback, delay_ms=400):
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._job = None
+
+    def trigger(self, event=None):
+        self.cancel()
+        self._job = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _fire(self):
+        self._job = None
+        self.callback()
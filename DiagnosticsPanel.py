@@ -0,0 +1,101 @@
+# DiagnosticsPanel.py
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+
+class DiagnosticsPanel:
+    """
+    Toplevel window showing a MetricsRegistry: per-endpoint request
+    latency (total vs. time to headers), UI timings and component
+    counters (caches, pool, coalescing). Refreshes itself while open and
+    can export the metrics as JSON or Prometheus text.
+    """
+
+    REFRESH_MS = 2000
+
+    COLUMNS = [
+        ("name", "Endpoint / timing", 300),
+        ("count", "Count", 60),
+        ("p50", "p50 ms", 70),
+        ("p95", "p95 ms", 70),
+        ("p99", "p99 ms", 70),
+        ("server", "Server p50", 80),
+        ("statuses", "Statuses", 140),
+        ("bytes", "Bytes", 90),
+        ("retries", "Retries", 60),
+    ]
+
+    def __init__(self, root, metrics):
+        self.metrics = metrics
+        self._job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Diagnostics")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.table = ttk.Treeview(
+            self.window,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show="headings",
+            height=14
+        )
+        for key, heading, width in self.COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, stretch=(key == "name"))
+        self.table.pack(fill="both", expand=True, padx=8, pady=8)
+
+        self.sources = tk.Text(self.window, height=10, wrap="none")
+        self.sources.pack(fill="both", expand=True, padx=8)
+
+        buttons = tk.Frame(self.window)
+        buttons.pack(fill="x", padx=8, pady=8)
+        ttk.Button(buttons, text="Export JSON", command=self.export_json).pack(side="left")
+        ttk.Button(buttons, text="Export Prometheus", command=self.export_prometheus)\
+            .pack(side="left", padx=6)
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side="right")
+
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.metrics.snapshot()
+
+        self.table.delete(*self.table.get_children())
+        for name, s in sorted(snapshot["endpoints"].items()):
+            statuses = ", ".join(f"{k}:{v}" for k, v in sorted(s["statuses"].items()))
+            self.table.insert("", tk.END, values=(
+                name, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"],
+                s["server_p50_ms"], statuses, s["bytes"], s["retries"]
+            ))
+        for name, s in sorted(snapshot["timings"].items()):
+            self.table.insert("", tk.END, values=(
+                f"[ui] {name}", s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"],
+                "", "", "", ""
+            ))
+
+        self.sources.delete("1.0", tk.END)
+        for name, stats in snapshot["sources"].items():
+            values = "  ".join(f"{k}={v}" for k, v in stats.items())
+            self.sources.insert(tk.END, f"{name}: {values}\n")
+
+        self._job = self.window.after(self.REFRESH_MS, self.refresh)
+
+    def export_json(self):
+        self._export(".json", self.metrics.to_json())
+
+    def export_prometheus(self):
+        self._export(".prom", self.metrics.to_prometheus())
+
+    def _export(self, extension, content):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=extension)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+    def reset(self):
+        self.metrics.reset()
+
+    def close(self):
+        if self._job is not None:
+            self.window.after_cancel(self._job)
+            self._job = None
+        self.window.destroy()
@@ -0,0 +1,86 @@
+# NotesPrefetcher.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NotesPrefetcher:
+    """
+    Fetches the initial description of a whole result page concurrently.
+
+    Work runs on a bounded worker pool, never on the Tk main thread.
+    Callbacks fire on the worker threads, so UI callers must marshal them
+    back with root.after(). When a TicketSearchIndex is given, every
+    fetched set of notes is also fed into it.
+    """
+
+    def __init__(self, api_client, max_workers=8, index=None):
+        self.api = api_client
+        self.index = index
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="notes-prefetch"
+        )
+
+    def prefetch(self, ticket_ids, on_result, on_error=None, on_done=None):
+        """
+        Starts one description fetch per ticket.
+
+        Args:
+            ticket_ids (list): tickets to hydrate
+            on_result (callable): on_result(ticket_id, description) per success
+            on_error (callable): on_error(ticket_id, exception) per failure
+            on_done (callable): called once after every ticket has finished
+
+        Returns:
+            list of futures, in ticket_ids order
+        """
+        ticket_ids = list(ticket_ids)
+        remaining = [len(ticket_ids)]
+        lock = threading.Lock()
+
+        if not ticket_ids:
+            if on_done:
+                on_done()
+            return []
+
+        def _finished(tid, future):
+            if not future.cancelled():
+                error = future.exception()
+                if error is None:
+                    on_result(tid, (future.result() or "").strip())
+                elif on_error:
+                    on_error(tid, error)
+
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and on_done:
+                on_done()
+
+        futures = []
+        for tid in ticket_ids:
+            future = self.executor.submit(self._fetch, tid)
+            future.add_done_callback(lambda f, tid=tid: _finished(tid, f))
+            futures.append(future)
+
+        return futures
+
+    def _fetch(self, ticket_id):
+        notes = self.api.get_ticket_notes(
+            ticket_id,
+            detail=True,
+            internal=False,
+            resolution=False
+        )
+
+        if self.index is not None:
+            self.index.index_notes(ticket_id, notes)
+
+        for note in notes:
+            if note.get("detailDescriptionFlag"):
+                return note.get("text")
+
+        return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,282 @@
+# ResultsView.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class ResultsView:
+    """
+    Virtualized ticket list with an on-demand detail pane.
+
+    Only as many Treeview rows exist as fit on screen; scrolling rebinds
+    those rows to a window over the result list instead of creating one
+    widget item per ticket. Appended results are formatted in time-sliced
+    chunks through after() so large pages never block the main loop, and
+    descriptions live in a dict that is only rendered for the selected row.
+    """
+
+    CHUNK = 50          # rows formatted per after() tick
+    ROW_HEIGHT = 22     # px, used to size the visible window
+
+    def __init__(self, parent, columns, row_builder, on_open=None,
+                 bg=None, fg=None, detail_height=12, metrics=None):
+        """
+        Args:
+            parent: container widget
+            columns (list): (key, heading, width) per column
+            row_builder (callable): ticket -> (row_id, values tuple)
+            on_open (callable): on_open(row_id) the first time a row is
+                                selected, e.g. to fetch its details lazily
+            metrics (MetricsRegistry): optional; chunk render times are
+                                       recorded as "render.chunk"
+        """
+        self.root = parent.winfo_toplevel()
+        self.columns = columns
+        self.row_builder = row_builder
+        self.on_open = on_open
+        self.metrics = metrics
+
+        self._rows = []         # [(row_id, values)]
+        self._positions = {}    # row_id -> index in _rows
+        self._details = {}      # row_id -> detail text
+        self._opened = set()
+        self._pending = []
+        self._drain_job = None
+        self._offset = 0
+        self._visible = 20
+        self._selected = None   # index into _rows
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.frame.pack(fill="both", expand=True)
+
+        self.message = ttk.Label(self.frame, text="")
+        self.message.pack(anchor="w", pady=(0, 4))
+
+        panes = ttk.PanedWindow(self.frame, orient="vertical")
+        panes.pack(fill="both", expand=True)
+
+        # ---- Virtualized list ----
+        list_frame = tk.Frame(panes, bg=bg)
+        self.scrollbar = tk.Scrollbar(list_frame, width=18, command=self._yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(
+            list_frame,
+            columns=[key for key, _, _ in columns],
+            show="headings",
+            selectmode="browse",
+            height=self._visible
+        )
+        for key, heading, width in columns:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, stretch=(key == "summary"))
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._slots = []
+        self._resize_slots(self._visible)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll(3))
+        panes.add(list_frame, weight=3)
+
+        # ---- Detail pane ----
+        self.detail = tk.Text(
+            panes, bg=bg or "white", fg=fg or "black", insertbackground=fg or "black",
+            wrap="word", padx=8, pady=8, height=detail_height
+        )
+        panes.add(self.detail, weight=2)
+
+    # ---------------------------------------
+    # PUBLIC API
+    # ---------------------------------------
+    def clear(self):
+        """Drops every row and detail of the previous search."""
+        if self._drain_job is not None:
+            self.root.after_cancel(self._drain_job)
+            self._drain_job = None
+
+        self._rows = []
+        self._positions = {}
+        self._details = {}
+        self._opened = set()
+        self._pending = []
+        self._offset = 0
+        self._selected = None
+
+        self.detail.delete("1.0", tk.END)
+        self.set_message("")
+        self._refresh()
+
+    def set_message(self, text):
+        self.message.config(text=text)
+
+    def append(self, tickets):
+        """Queues tickets; they are formatted and shown CHUNK at a time."""
+        self._pending.extend(tickets)
+        if self._drain_job is None:
+            self._drain_job = self.root.after(0, self._drain)
+
+    def apply_changes(self, changed, removed=()):
+        """
+        Applies a delta in place: changed tickets already listed are
+        re-rendered where they are, new ones go to the top (newest first)
+        and removed row ids are dropped. The selection stays on the same
+        ticket, and changed rows are opened again on their next select.
+        """
+        # Queued rows would otherwise land after the delta
+        while self._pending:
+            self._drain_chunk()
+
+        selected = self._selected_id()
+        removed = set(removed)
+        added = []
+
+        for ticket in changed:
+            row_id, values = self.row_builder(ticket)
+            self._opened.discard(row_id)
+            if row_id in self._positions:
+                self._rows[self._positions[row_id]] = (row_id, values)
+            else:
+                added.append((row_id, values))
+
+        if added or removed:
+            kept = [row for row in self._rows if row[0] not in removed]
+            self._rows = added[::-1] + kept
+            self._positions = {row_id: i for i, (row_id, _) in enumerate(self._rows)}
+            for row_id in removed:
+                self._details.pop(row_id, None)
+                self._opened.discard(row_id)
+
+            # Scrolled down: keep the same tickets on screen
+            if self._offset:
+                self._offset += len(added)
+
+            if selected in self._positions:
+                self._selected = self._positions[selected]
+            else:
+                self._selected = None
+                self.detail.delete("1.0", tk.END)
+
+        self._refresh()
+
+    def set_detail(self, row_id, text):
+        self._details[row_id] = text
+        if self._selected_id() == row_id:
+            self._show_detail(row_id)
+
+    def count(self):
+        return len(self._rows) + len(self._pending)
+
+    # ---------------------------------------
+    # TIME-SLICED RENDERING
+    # ---------------------------------------
+    def _drain(self):
+        if self.metrics is None:
+            self._drain_chunk()
+        else:
+            with self.metrics.timed("render.chunk"):
+                self._drain_chunk()
+
+        if self._pending:
+            self._drain_job = self.root.after(1, self._drain)
+        else:
+            self._drain_job = None
+
+    def _drain_chunk(self):
+        chunk, self._pending = self._pending[:self.CHUNK], self._pending[self.CHUNK:]
+
+        for ticket in chunk:
+            row_id, values = self.row_builder(ticket)
+            if row_id in self._positions:
+                self._rows[self._positions[row_id]] = (row_id, values)
+            else:
+                self._positions[row_id] = len(self._rows)
+                self._rows.append((row_id, values))
+
+        self._refresh()
+
+    # ---------------------------------------
+    # VIRTUALIZATION
+    # ---------------------------------------
+    def _resize_slots(self, count):
+        while len(self._slots) < count:
+            self._slots.append(self.tree.insert("", tk.END, values=()))
+        while len(self._slots) > count:
+            self.tree.delete(self._slots.pop())
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.ROW_HEIGHT - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._resize_slots(visible)
+            self._refresh()
+
+    def _refresh(self):
+        total = len(self._rows)
+        self._offset = max(0, min(self._offset, total - self._visible))
+
+        for i, slot in enumerate(self._slots):
+            index = self._offset + i
+            values = self._rows[index][1] if index < total else ()
+            self.tree.item(slot, values=values)
+
+        # Keep the highlight on the selected ticket, not on its old slot
+        selected = self._selected
+        if selected is not None and self._offset <= selected < self._offset + len(self._slots):
+            self.tree.selection_set(self._slots[selected - self._offset])
+        else:
+            self.tree.selection_set(())
+
+        if total:
+            self.scrollbar.set(self._offset / total,
+                               min(1.0, (self._offset + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _yview(self, *args):
+        total = len(self._rows)
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._offset += step * (self._visible if args[2] == "pages" else 1)
+        self._refresh()
+
+    def _scroll(self, units):
+        self._offset += units
+        self._refresh()
+
+    def _on_wheel(self, event):
+        self._scroll(-3 if event.delta > 0 else 3)
+
+    # ---------------------------------------
+    # SELECTION / DETAIL
+    # ---------------------------------------
+    def _selected_id(self):
+        if self._selected is None or self._selected >= len(self._rows):
+            return None
+        return self._rows[self._selected][0]
+
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+
+        # Also fires for the highlight _refresh() restores; ignore those
+        index = self._offset + self._slots.index(selection[0])
+        if index >= len(self._rows) or index == self._selected:
+            return
+
+        self._selected = index
+        row_id = self._rows[index][0]
+        self._show_detail(row_id)
+
+        if row_id not in self._opened and self.on_open:
+            self._opened.add(row_id)
+            self.on_open(row_id)
+
+    def _show_detail(self, row_id):
+        self.detail.delete("1.0", tk.END)
+        self.detail.insert(tk.END, self._details.get(row_id, "Loading..."))
@@ -0,0 +1,171 @@
+# SearchIndex.py
+import re
+import sqlite3
+import threading
+
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ticket_fts USING fts5(
+    summary,
+    initial_description,
+    internal_analysis,
+    resolution,
+    company UNINDEXED,
+    board UNINDEXED,
+    status UNINDEXED
+);
+"""
+
+# bm25 column weights: summary, description, internal analysis, resolution
+RANK = "bm25(ticket_fts, 4.0, 2.0, 1.0, 1.0, 0.0, 0.0, 0.0)"
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def to_match_query(text):
+    """
+    Turns what a user types into an FTS5 MATCH expression.
+
+    "quoted text" stays a phrase, a trailing * makes a prefix query and
+    everything else is matched as a literal term, so IPs, MACs and other
+    punctuation-heavy values never trip the FTS5 query syntax.
+    """
+    terms = []
+
+    for phrase, word in _TERM.findall(text):
+        if phrase:
+            terms.append('"' + phrase.replace('"', '""') + '"')
+        elif word.endswith("*") and len(word) > 1:
+            terms.append('"' + word[:-1].replace('"', '""') + '"*')
+        elif word != "*":
+            terms.append('"' + word.replace('"', '""') + '"')
+
+    return " ".join(terms)
+
+
+class TicketSearchIndex:
+    """
+    Offline full-text index (SQLite FTS5) over ticket text.
+
+    Rows are keyed by ticket id and filled in piecemeal: index_tickets()
+    stores the list-view fields, index_notes() the description, internal
+    analysis and resolution text, whichever arrives first.
+    """
+
+    def __init__(self, path="tickets.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---------------------------------------
+    # FEEDING
+    # ---------------------------------------
+    def index_tickets(self, tickets):
+        rows = [
+            (
+                t["id"],
+                {
+                    "summary": t.get("summary") or "",
+                    "company": (t.get("company") or {}).get("name") or "",
+                    "board": (t.get("board") or {}).get("name") or "",
+                    "status": (t.get("status") or {}).get("name") or "",
+                },
+            )
+            for t in tickets if "id" in t
+        ]
+        self._merge(rows)
+
+    def index_notes(self, ticket_id, notes):
+        description = ""
+        internal = []
+        resolution = []
+
+        for note in notes or []:
+            text = (note.get("text") or "").strip()
+            if note.get("detailDescriptionFlag") and not description:
+                description = text
+            if note.get("internalAnalysisFlag"):
+                internal.append(text)
+            if note.get("resolutionFlag"):
+                resolution.append(text)
+
+        self._merge([(ticket_id, {
+            "initial_description": description,
+            "internal_analysis": "\n".join(internal),
+            "resolution": "\n".join(resolution),
+        })])
+
+    def _merge(self, rows):
+        columns = ("summary", "initial_description", "internal_analysis",
+                   "resolution", "company", "board", "status")
+
+        with self._lock, self.conn:
+            for ticket_id, values in rows:
+                existing = self.conn.execute(
+                    f"SELECT {', '.join(columns)} FROM ticket_fts WHERE rowid = ?",
+                    (ticket_id,)
+                ).fetchone()
+
+                merged = dict(zip(columns, existing or [""] * len(columns)))
+                merged.update(values)
+
+                self.conn.execute("DELETE FROM ticket_fts WHERE rowid = ?", (ticket_id,))
+                self.conn.execute(
+                    f"INSERT INTO ticket_fts (rowid, {', '.join(columns)}) "
+                    f"VALUES (?, {', '.join('?' * len(columns))})",
+                    (ticket_id, *(merged[c] for c in columns))
+                )
+
+    # ---------------------------------------
+    # SEARCH
+    # ---------------------------------------
+    def search(self, text, board=None, status=None, limit=50):
+        """
+        Ranked full-text search.
+
+        Returns:
+            list of dicts (id, summary, company, board, status, snippet),
+            best match first
+        """
+        query = to_match_query(text)
+        if not query:
+            return []
+
+        sql = (
+            "SELECT rowid, summary, company, board, status, "
+            "snippet(ticket_fts, -1, '[', ']', '…', 12) "
+            "FROM ticket_fts WHERE ticket_fts MATCH ?"
+        )
+        args = [query]
+
+        if board:
+            sql += " AND board = ?"
+            args.append(board)
+        if status:
+            sql += " AND status = ?"
+            args.append(status)
+
+        sql += f" ORDER BY {RANK} LIMIT ?"
+        args.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, args).fetchall()
+
+        return [
+            {
+                "id": r[0],
+                "summary": r[1],
+                "company": r[2],
+                "board": r[3],
+                "status": r[4],
+                "snippet": r[5],
+            }
+            for r in rows
+        ]
@@ -32,6 +32,19 @@ def apply_styles():
                     foreground=DARK_TEXT,
                     relief="flat")
 
+    style.configure("Treeview",
+                    background="#111316",
+                    fieldbackground="#111316",
+                    foreground=DARK_TEXT,
+                    rowheight=22)
+
+    style.configure("Treeview.Heading",
+                    background=DARK_PANEL,
+                    foreground=DARK_TEXT)
+
+    style.map("Treeview",
+              background=[("selected", ACCENT)])
+
 def create_page_size_dropdown(parent):
     """
     Creates a standardized 'Page Size' label + combobox using global styles.
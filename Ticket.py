@@ -0,0 +1,130 @@
+# Ticket.py
+import json
+import sys
+import zlib
+
+# Text bodies that are rarely looked at; kept compressed until asked for
+HEAVY_FIELDS = ("initialDescription", "description", "internalAnalysis", "resolution", "notes")
+
+_CORE_FIELDS = {"id", "summary", "owner", "board", "status", "company", "team", "_info"}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _name(obj, key="name"):
+    return obj.get(key) if isinstance(obj, dict) else None
+
+
+class Ticket:
+    """
+    Compact ticket built straight from an API payload.
+
+    The fields every list shows are plain slots, and the values that
+    repeat across thousands of tickets (owner, board, status, company,
+    team) are interned so each distinct string exists once. Heavy text
+    fields are stored zlib-compressed and only decoded on access; any
+    other fields (e.g. from the export projection) are kept as-is so
+    to_dict() can rebuild the original shape.
+    """
+
+    __slots__ = ("id", "summary", "owner", "board", "status", "company",
+                 "company_identifier", "team", "last_updated", "_extra", "_heavy")
+
+    def __init__(self, id, summary="", owner="", board="", status="", company="",
+                 company_identifier="", team="", last_updated=None, extra=None, heavy=None):
+        self.id = id
+        self.summary = summary or ""
+        self.owner = _intern(owner or "")
+        self.board = _intern(board or "")
+        self.status = _intern(status or "")
+        self.company = _intern(company or "")
+        self.company_identifier = _intern(company_identifier or "")
+        self.team = _intern(team or "")
+        self.last_updated = last_updated
+        self._extra = extra or None
+        self._heavy = zlib.compress(json.dumps(heavy).encode("utf-8")) if heavy else None
+
+    @classmethod
+    def from_api(cls, payload):
+        company = payload.get("company")
+        info = payload.get("_info") or {}
+
+        heavy = {k: payload[k] for k in HEAVY_FIELDS if payload.get(k) is not None}
+        extra = {k: v for k, v in payload.items()
+                 if k not in _CORE_FIELDS and k not in HEAVY_FIELDS}
+        if info.keys() - {"lastUpdated"}:
+            extra["_info"] = {k: v for k, v in info.items() if k != "lastUpdated"}
+
+        return cls(
+            payload.get("id"),
+            summary=payload.get("summary"),
+            owner=_name(payload.get("owner"), "identifier"),
+            board=_name(payload.get("board")),
+            status=_name(payload.get("status")),
+            company=_name(company),
+            company_identifier=_name(company, "identifier"),
+            team=_name(payload.get("team")),
+            last_updated=info.get("lastUpdated") or payload.get("lastUpdated"),
+            extra=extra,
+            heavy=heavy,
+        )
+
+    # ---------------------------------------
+    # LAZY FIELDS
+    # ---------------------------------------
+    def heavy(self, name, default=None):
+        """Decodes one heavy field on demand (nothing is cached)."""
+        if self._heavy is None:
+            return default
+        return json.loads(zlib.decompress(self._heavy)).get(name, default)
+
+    @property
+    def has_details(self):
+        return self._heavy is not None
+
+    @property
+    def initial_description(self):
+        return self.heavy("initialDescription") or self.heavy("description") or ""
+
+    def extra(self, name, default=None):
+        return (self._extra or {}).get(name, default)
+
+    # ---------------------------------------
+    # CONVERSION
+    # ---------------------------------------
+    def company_label(self):
+        if self.company_identifier:
+            return f"{self.company} ({self.company_identifier})"
+        return self.company
+
+    def to_dict(self):
+        """The ticket in API payload shape (for storage and export)."""
+        data = {"id": self.id, "summary": self.summary}
+
+        if self.owner:
+            data["owner"] = {"identifier": self.owner}
+        if self.board:
+            data["board"] = {"name": self.board}
+        if self.status:
+            data["status"] = {"name": self.status}
+        if self.company or self.company_identifier:
+            data["company"] = {"name": self.company, "identifier": self.company_identifier}
+        if self.team:
+            data["team"] = {"name": self.team}
+
+        extra = dict(self._extra or {})
+        info = extra.pop("_info", {})
+        if self.last_updated:
+            info = dict(info, lastUpdated=self.last_updated)
+        if info:
+            data["_info"] = info
+
+        data.update(extra)
+        if self._heavy is not None:
+            data.update(json.loads(zlib.decompress(self._heavy)))
+        return data
+
+    def __repr__(self):
+        return f"Ticket(id={self.id!r}, summary={self.summary!r}, status={self.status!r})"
@@ -1,65 +1,128 @@
-import json
 from timer import Timer
+from Ticket import Ticket
+from query import Query
 
 class TicketService:
     """Business logic for filtering and working with tickets."""
 
-    def __init__(self, api_client):
+    def __init__(self, api_client, store=None):
         self.api = api_client
+        self.store = store
 
-    def unified_search(self, company=None, username=None, board=None, status=None, limit=25):
+    def unified_search(self, company=None, username=None, board=None, status=None, limit=25,
+                       refresh=False):
         """
         Flexible unified search combining any filter selection.
-        """
 
-        conditions = []
+        With a TicketStore attached the answer comes from the local copy
+        unless `refresh` is set, in which case the server is queried and
+        the results are written back to the store.
+        """
+        if self.store and not refresh:
+            tickets, ms = self.store.query(company, username, board, status, limit=limit)
+            return [Ticket.from_api(t) for t in tickets], ms
 
-        # Company → Convert to ID
-        if company:
-            try:
-                comp = self.api.get_company(company)
-                cid = comp["id"]
-                conditions.append(f"company/id={cid}")
-            except:
-                raise ValueError(f"Company '{company}' not found")
+        tickets = self.iter_unified_search(company, username, board, status, limit=limit)
 
-        if username:
-            conditions.append(f'owner/identifier contains "{username}"')
+        with Timer() as t:
+            tickets = list(tickets)
 
-        if board:
-            conditions.append(f'board/name="{board}"')
+        if self.store:
+            self.store.upsert_many(t.to_dict() for t in tickets)
 
-        if status:
-            conditions.append(f'status/name="{status}"')
+        return tickets, t.ms()
 
-        condition_str = " AND ".join(conditions) if conditions else None
+    def iter_unified_search(self, company=None, username=None, board=None, status=None,
+                            limit=None, page_size=None, use_cache=False, on_update=None,
+                            profile="list", order_by=None, stream=False):
+        """
+        Same filters as unified_search, but returns a lazy iterator over
+        every matching Ticket (up to `limit`), fetched page by page.
+        `use_cache`, `on_update`, `profile`, `order_by` and `stream` are
+        passed through to iter_tickets.
 
-        with Timer() as t:
-            tickets = self.api.get_tickets(
-                conditions=condition_str,
-                page=1,
-                page_size=limit
-            )
+        Every filter (company included, by identifier) goes into one
+        server-side conditions expression; no lookups are made first.
+        """
+        query = Query.tickets(company=company, owner=username, board=board, status=status)
 
-        return tickets[:limit], t.ms()
+        return (Ticket.from_api(t) for t in self.api.iter_tickets(
+            conditions=query,
+            page_size=page_size,
+            max_results=limit,
+            order_by=order_by,
+            use_cache=use_cache,
+            on_update=on_update,
+            profile=profile,
+            stream=stream
+        ))
 
 
-    def get_tickets_for_user(self, username, limit=10):
+    def get_tickets_for_user(self, username, limit=10, refresh=False):
         """
         Returns tickets where owner.identifier matches the username
         and returns only the number specified by `limit`.
         """
-        username = username.strip()
+        if self.store and not refresh:
+            tickets, ms = self.store.query(username=username.strip(), limit=limit)
+            return [Ticket.from_api(t) for t in tickets], ms
 
-        # ConnectWise 'contains' handles partial matches & case insensitivity
-        conditions = f'owner/identifier contains "{username}"'
+        tickets = self.iter_tickets_for_user(username, limit=limit)
 
         with Timer() as t:
-            # pass page_size so API returns up to `limit`
-            tickets = self.api.get_tickets(
-                conditions=conditions,
-                page_size=limit,
-                page=1
-            )
-
-        return tickets[:limit], t.ms()
+            tickets = list(tickets)
+
+        if self.store:
+            self.store.upsert_many(t.to_dict() for t in tickets)
+
+        return tickets, t.ms()
+
+    def iter_tickets_for_user(self, username, limit=None, page_size=None,
+                              use_cache=False, on_update=None, profile="list"):
+        """Lazy iterator over Tickets owned by `username` (up to `limit`)."""
+        return (Ticket.from_api(t) for t in self.api.iter_tickets(
+            conditions=Query().owner(username),
+            page_size=page_size,
+            max_results=limit,
+            use_cache=use_cache,
+            on_update=on_update,
+            profile=profile
+        ))
+
+
+class AsyncTicketService:
+    """TicketService on top of AsyncConnectWiseAPIClient."""
+
+    def __init__(self, api_client):
+        self.api = api_client
+
+    async def unified_search(self, company=None, username=None, board=None, status=None, limit=25):
+        tickets = self.iter_unified_search(company, username, board, status, limit=limit)
+
+        with Timer() as t:
+            tickets = [ticket async for ticket in tickets]
+
+        return tickets, t.ms()
+
+    def iter_unified_search(self, company=None, username=None, board=None, status=None,
+                            limit=None, page_size=None):
+        query = Query.tickets(company=company, owner=username, board=board, status=status)
+
+        return (Ticket.from_api(t) async for t in self.api.iter_tickets(
+            conditions=query,
+            page_size=page_size,
+            max_results=limit
+        ))
+
+    async def get_tickets_for_user(self, username, limit=10):
+        with Timer() as t:
+            tickets = [ticket async for ticket in self.iter_tickets_for_user(username, limit=limit)]
+
+        return tickets, t.ms()
+
+    def iter_tickets_for_user(self, username, limit=None, page_size=None):
+        return (Ticket.from_api(t) async for t in self.api.iter_tickets(
+            conditions=Query().owner(username),
+            page_size=page_size,
+            max_results=limit
+        ))
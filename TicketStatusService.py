@@ -1,12 +1,15 @@
 from timer import Timer
+from Ticket import Ticket
+from query import Query
 
 class TicketStatusService:
     """Business logic for filtering tickets by board + status."""
 
-    def __init__(self, api_client):
+    def __init__(self, api_client, store=None):
         self.api = api_client
+        self.store = store
 
-    def get_tickets_by_status(self, board_name=None, status_name=None, limit=20):
+    def get_tickets_by_status(self, board_name=None, status_name=None, limit=20, refresh=False):
         """
         Returns tickets filtered by board and/or status.
 
@@ -14,29 +17,60 @@ class TicketStatusService:
             board_name (str): e.g. "Service Desk"
             status_name (str): e.g. "New", "In Progress"
             limit (int): number of tickets to return (default 20)
+            refresh (bool): bypass the local TicketStore and query the server
 
         Returns:
             (tickets, elapsed_ms)
         """
+        if self.store and not refresh:
+            tickets, ms = self.store.query(board=board_name, status=status_name, limit=limit)
+            return [Ticket.from_api(t) for t in tickets], ms
+
+        tickets = self.iter_tickets_by_status(board_name, status_name, limit=limit)
+
+        with Timer() as t:
+            tickets = list(tickets)
 
-        # Build CW conditions string
-        conditions_list = []
+        if self.store:
+            self.store.upsert_many(t.to_dict() for t in tickets)
 
-        if board_name:
-            conditions_list.append(f'board/name="{board_name}"')
+        return tickets, t.ms()
+
+    def iter_tickets_by_status(self, board_name=None, status_name=None,
+                               limit=None, page_size=None, use_cache=False, on_update=None,
+                               profile="list"):
+        """
+        Lazy iterator over Tickets on a board/status (up to `limit`).
+        `use_cache`, `on_update` and `profile` are passed through to iter_tickets.
+        """
+        return (Ticket.from_api(t) for t in self.api.iter_tickets(
+            conditions=Query().board(board_name).status(status_name),
+            page_size=page_size,
+            max_results=limit,
+            use_cache=use_cache,
+            on_update=on_update,
+            profile=profile
+        ))
 
-        if status_name:
-            conditions_list.append(f'status/name="{status_name}"')
 
-        # Combine conditions with AND
-        conditions = " AND ".join(conditions_list) if conditions_list else None
+class AsyncTicketStatusService:
+    """TicketStatusService on top of AsyncConnectWiseAPIClient."""
+
+    def __init__(self, api_client):
+        self.api = api_client
+
+    async def get_tickets_by_status(self, board_name=None, status_name=None, limit=20):
+        tickets = self.iter_tickets_by_status(board_name, status_name, limit=limit)
 
         with Timer() as t:
-            # Minimal: pass page_size so API returns correct number
-            tickets = self.api.get_tickets(
-                conditions=conditions,
-                page_size=limit,
-                page=1
-            )
-
-        return tickets[:limit], t.ms()
+            tickets = [ticket async for ticket in tickets]
+
+        return tickets, t.ms()
+
+    def iter_tickets_by_status(self, board_name=None, status_name=None,
+                               limit=None, page_size=None):
+        return (Ticket.from_api(t) async for t in self.api.iter_tickets(
+            conditions=Query().board(board_name).status(status_name),
+            page_size=page_size,
+            max_results=limit
+        ))
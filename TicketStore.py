@@ -0,0 +1,229 @@
+# TicketStore.py
+import json
+import sqlite3
+import threading
+
+from timer import Timer
+from query import Query
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id                  INTEGER PRIMARY KEY,
+    summary             TEXT,
+    owner_identifier    TEXT COLLATE NOCASE,
+    board_name          TEXT,
+    status_name         TEXT,
+    company_name        TEXT COLLATE NOCASE,
+    company_identifier  TEXT COLLATE NOCASE,
+    last_updated        TEXT,
+    payload             TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_owner   ON tickets (owner_identifier);
+CREATE INDEX IF NOT EXISTS idx_tickets_board   ON tickets (board_name, status_name);
+CREATE INDEX IF NOT EXISTS idx_tickets_status  ON tickets (status_name);
+CREATE INDEX IF NOT EXISTS idx_tickets_company ON tickets (company_identifier);
+CREATE INDEX IF NOT EXISTS idx_tickets_updated ON tickets (last_updated);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name       TEXT PRIMARY KEY,
+    watermark  TEXT
+);
+"""
+
+# Fields the sync engine asks for; _info/lastUpdated drives the watermark.
+# Changing them makes the next sync fetch everything again.
+SYNC_FIELDS = (
+    "id,summary,owner/identifier,status/name,board/name,"
+    "company/name,company/identifier,team/name,_info/lastUpdated"
+)
+
+
+def last_updated(ticket):
+    """ConnectWise reports lastUpdated under _info; older callers flatten it."""
+    return (ticket.get("_info") or {}).get("lastUpdated") or ticket.get("lastUpdated")
+
+
+class TicketStore:
+    """
+    Local SQLite copy of tickets, indexed on the columns the UI filters by.
+
+    One connection is shared across threads behind a lock; WAL mode keeps
+    reads cheap while a sync is writing.
+    """
+
+    def __init__(self, path="tickets.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---------------------------------------
+    # WRITES
+    # ---------------------------------------
+    def upsert_many(self, tickets):
+        rows = [
+            (
+                t["id"],
+                t.get("summary"),
+                (t.get("owner") or {}).get("identifier"),
+                (t.get("board") or {}).get("name"),
+                (t.get("status") or {}).get("name"),
+                (t.get("company") or {}).get("name"),
+                (t.get("company") or {}).get("identifier"),
+                last_updated(t),
+                json.dumps(t),
+            )
+            for t in tickets
+        ]
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        return len(rows)
+
+    # ---------------------------------------
+    # READS
+    # ---------------------------------------
+    def query(self, company=None, username=None, board=None, status=None,
+              limit=25, newest_first=True):
+        """
+        Same filters as TicketService.unified_search, answered locally.
+
+        Returns:
+            (tickets, elapsed_ms)
+        """
+        clauses = []
+        args = []
+
+        if company:
+            clauses.append("company_identifier = ?")
+            args.append(company)
+
+        if username:
+            clauses.append("owner_identifier LIKE ?")
+            args.append(f"%{username}%")
+
+        if board:
+            clauses.append("board_name = ?")
+            args.append(board)
+
+        if status:
+            clauses.append("status_name = ?")
+            args.append(status)
+
+        sql = "SELECT payload FROM tickets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY last_updated {'DESC' if newest_first else 'ASC'} LIMIT ?"
+        args.append(limit)
+
+        with Timer() as t:
+            with self._lock:
+                rows = self.conn.execute(sql, args).fetchall()
+            tickets = [json.loads(r["payload"]) for r in rows]
+
+        return tickets, t.ms()
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+
+    # ---------------------------------------
+    # SYNC WATERMARKS
+    # ---------------------------------------
+    def get_watermark(self, name="tickets"):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT watermark FROM sync_state WHERE name = ?", (name,)
+            ).fetchone()
+        return row["watermark"] if row else None
+
+    def set_watermark(self, watermark, name="tickets"):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, watermark)
+            )
+
+
+class TicketSync:
+    """
+    Incremental sync: pulls only tickets whose lastUpdated is at or after
+    the stored watermark and upserts them into a TicketStore.
+
+    The boundary uses >= so a ticket updated in the same second as the
+    previous watermark is not missed; re-upserting it is harmless. The
+    fields last synced are stored too: rows fetched with different
+    SYNC_FIELDS are refetched by a full sync. Synced tickets are also fed
+    to an optional TicketSearchIndex.
+    """
+
+    def __init__(self, api_client, store, conditions=None, page_size=1000,
+                 batch_size=500, name="tickets", index=None):
+        self.api = api_client
+        self.store = store
+        self.index = index
+        self.conditions = conditions
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.name = name
+
+    def sync(self):
+        """
+        Returns:
+            dict with tickets fetched, the new watermark and elapsed ms
+        """
+        fields_state = f"{self.name}/fields"
+        if self.store.get_watermark(fields_state) != SYNC_FIELDS:
+            # Start over; oldest first, so an interrupted run still resumes
+            self.store.set_watermark(None, self.name)
+            self.store.set_watermark(SYNC_FIELDS, fields_state)
+
+        watermark = self.store.get_watermark(self.name)
+        query = Query().updated_since(watermark).raw(self.conditions)
+
+        fetched = 0
+        batch = []
+
+        with Timer() as t:
+            # Oldest first, so the watermark can advance after every batch
+            # and an interrupted sync resumes where it stopped.
+            for ticket in self.api.iter_tickets(
+                conditions=query,
+                page_size=self.page_size,
+                order_by="lastUpdated asc",
+                fields=SYNC_FIELDS
+            ):
+                batch.append(ticket)
+                if len(batch) >= self.batch_size:
+                    fetched += self._flush(batch)
+                    watermark = self.store.get_watermark(self.name)
+                    batch = []
+
+            if batch:
+                fetched += self._flush(batch)
+                watermark = self.store.get_watermark(self.name)
+
+        return {"fetched": fetched, "watermark": watermark, "ms": t.ms()}
+
+    def _flush(self, batch):
+        count = self.store.upsert_many(batch)
+        if self.index is not None:
+            self.index.index_tickets(batch)
+
+        newest = max((last_updated(t) or "" for t in batch), default="")
+        if newest and newest > (self.store.get_watermark(self.name) or ""):
+            self.store.set_watermark(newest, self.name)
+
+        return count
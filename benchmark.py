@@ -0,0 +1,245 @@
+# benchmark.py
+"""
+Offline performance benchmarks against mock_server.py.
+
+    python benchmark.py                          # run and print
+    python benchmark.py --save bench.json        # record a baseline
+    python benchmark.py --baseline bench.json    # compare; exit 1 on regression
+    python benchmark.py --memory 100000          # also compare dict vs Ticket memory
+
+The mock dataset is seeded and the latency fixed, so medians from two
+runs on the same machine are comparable.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import tracemalloc
+
+from ConnectWiseApi import ConnectWiseAPIClient
+from NotesPrefetcher import NotesPrefetcher
+from Ticket import Ticket
+from TicketService import TicketService
+from identifiers import IdentifierExtractor
+from log import configure
+from mock_server import MockConfig, MockConnectWiseServer, build_dataset, description_for
+from scheduler import RequestScheduler
+from timer import Timer
+
+
+def make_client(server, name):
+    # The default limiter, so a default that throttles normal use shows up here
+    scheduler = RequestScheduler(f"bench-{name}")
+    return ConnectWiseAPIClient("bench", "bench", "bench-client",
+                                base_url=server.base_url, scheduler=scheduler)
+
+
+# ---------------------------------------
+# BENCHMARKS
+# Each returns (items processed, callable running one iteration)
+# ---------------------------------------
+def bench_get_tickets(server, args):
+    client = make_client(server, "get_tickets")
+    return args.page_size, lambda: client.get_tickets(page_size=args.page_size)
+
+
+def bench_notes_fanout(server, args, name="notes_fanout"):
+    # Same path as AppSidebarDark.display_tickets: one notes fetch per row
+    client = make_client(server, name)
+    prefetcher = NotesPrefetcher(client, max_workers=8)
+    ids = [t["id"] for t in server.tickets[:args.fanout]]
+
+    def run():
+        done = threading.Event()
+        prefetcher.prefetch(ids, on_result=lambda tid, text: None, on_done=done.set)
+        done.wait()
+
+    return len(ids), run
+
+
+def bench_extract_identifiers(server, args):
+    extractor = IdentifierExtractor()
+    items = [(t["id"], description_for(t["id"], server.config.description_bytes))
+             for t in server.tickets[:args.extract]]
+    return len(items), lambda: extractor.extract_many(items)
+
+
+def bench_unified_search(server, args):
+    service = TicketService(make_client(server, "unified_search"))
+    company = server.tickets[0]["company"]["identifier"]
+    return args.search_limit, lambda: service.unified_search(
+        company=company, limit=args.search_limit, refresh=True
+    )
+
+
+BENCHMARKS = {
+    "get_tickets": bench_get_tickets,
+    "notes_fanout": bench_notes_fanout,
+    "extract_identifiers": bench_extract_identifiers,
+    "unified_search": bench_unified_search,
+}
+
+
+def _held_bytes(build):
+    # Bytes still allocated once build() returns (what holding the result costs)
+    tracemalloc.start()
+    try:
+        held = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del held
+    return size
+
+
+def bench_memory(args):
+    """
+    Memory held by `args.memory` tickets as decoded dicts vs Tickets.
+
+    Payloads are re-encoded per ticket so, like real responses, no
+    strings are shared between them. Each one carries an export-style
+    description so the lazy text fields are part of the comparison.
+    """
+    config = MockConfig(tickets=args.memory, seed=args.seed)
+    raw = []
+    for t in build_dataset(config):
+        t["initialDescription"] = description_for(t["id"], args.description_bytes)
+        raw.append(json.dumps(t))
+
+    dict_bytes = _held_bytes(lambda: [json.loads(s) for s in raw])
+    ticket_bytes = _held_bytes(lambda: [Ticket.from_api(json.loads(s)) for s in raw])
+
+    return {
+        "tickets": args.memory,
+        "dict_bytes": dict_bytes,
+        "ticket_bytes": ticket_bytes,
+        "dict_bytes_per_ticket": round(dict_bytes / args.memory, 1),
+        "ticket_bytes_per_ticket": round(ticket_bytes / args.memory, 1),
+        "saved_ratio": round(1 - ticket_bytes / dict_bytes, 3) if dict_bytes else 0.0,
+    }
+
+
+def measure(setup, server, args):
+    items, run = setup(server, args)
+    run()   # warm-up: connections, lookups, regex caches
+
+    samples = []
+    for _ in range(args.repeat):
+        with Timer() as t:
+            run()
+        samples.append(t.ms())
+
+    median = statistics.median(samples)
+    return {
+        "items": items,
+        "median_ms": round(median, 2),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "items_per_sec": round(items / (median / 1000), 1) if median else None,
+    }
+
+
+def run_suite(args):
+    results = {}
+
+    config = MockConfig(
+        tickets=args.tickets,
+        description_bytes=args.description_bytes,
+        latency_ms=args.latency_ms,
+        seed=args.seed,
+    )
+    with MockConnectWiseServer(config) as server:
+        for name, setup in BENCHMARKS.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = measure(setup, server, args)
+
+    # Same fan-out with every Nth request answered 429 (exercises retries)
+    if args.throttle_every and (not args.only or "notes_fanout_throttled" in args.only):
+        config.throttle_every = args.throttle_every
+        with MockConnectWiseServer(config) as server:
+            results["notes_fanout_throttled"] = measure(
+                lambda s, a: bench_notes_fanout(s, a, "notes_fanout_throttled"), server, args
+            )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {k: v for k, v in vars(args).items()
+                         if k not in ("save", "baseline", "only")},
+        },
+        "results": results,
+    }
+
+    if args.memory:
+        report["memory"] = bench_memory(args)
+
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Prints a comparison table; returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<26}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:<26}{'-':>14}{result['median_ms']:>14}{'new':>10}")
+            continue
+
+        change = result["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        flag = "  REGRESSION" if change > tolerance else ""
+        print(f"{name:<26}{base['median_ms']:>14}{result['median_ms']:>14}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline RepScrape benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--description-bytes", type=int, default=600)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--fanout", type=int, default=100)
+    parser.add_argument("--extract", type=int, default=2000)
+    parser.add_argument("--search-limit", type=int, default=100)
+    parser.add_argument("--throttle-every", type=int, default=10,
+                        help="429 every Nth request in the throttled run (0 to skip)")
+    parser.add_argument("--memory", type=int, default=0,
+                        help="also measure memory held by this many tickets (0 to skip)")
+    parser.add_argument("--only", nargs="*", help="run only these benchmarks")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown vs. baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    configure(echo=False)
+    report = run_suite(args)
+    print(json.dumps(report["results"], indent=2))
+    if "memory" in report:
+        print(json.dumps({"memory": report["memory"]}, indent=2))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# board_metadata.py
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from log import log, warning
+from timer import Timer
+
+# Bumped whenever the file layout changes; older files are ignored
+FORMAT_VERSION = 1
+
+
+class BoardMetadataCache:
+    """
+    Every service board and its statuses, kept in memory and on disk.
+
+    The file is read synchronously at startup (cheap), so dropdowns are
+    filled straight away from the last run. refresh_async() then reloads
+    from the API in the background when the copy is older than `ttl`:
+    one request for the boards, then every board's statuses concurrently.
+    Until anything has been loaded, `fallback` ({board name: [status
+    names]}) is used instead.
+    """
+
+    def __init__(self, api, path="board_metadata.json", ttl=86400, max_workers=8, fallback=None):
+        self.api = api
+        self.path = path
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.fallback = fallback or {}
+
+        self._boards = {}       # id -> {"id", "name", "statuses": [{"id", "name"}]}
+        self._by_name = {}      # lowercased name -> id
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self.refreshes = 0
+        self.failures = 0
+
+        if self.path:
+            self.load()
+
+    # ---------------------------------------
+    # LOOKUPS
+    # ---------------------------------------
+    def board_names(self):
+        with self._lock:
+            if not self._boards:
+                return list(self.fallback)
+            return sorted(b["name"] for b in self._boards.values())
+
+    def board(self, name_or_id):
+        """The board dict for a name (case-insensitive) or id, or None."""
+        with self._lock:
+            return self._find(name_or_id)
+
+    def board_id(self, name):
+        board = self.board(name)
+        return board["id"] if board else None
+
+    def status_names(self, board):
+        with self._lock:
+            found = self._find(board)
+            if found is None:
+                return list(self.fallback.get(board, []))
+            return [s["name"] for s in found["statuses"]]
+
+    def status_id(self, board, status_name):
+        with self._lock:
+            found = self._find(board)
+            if found is None:
+                return None
+            wanted = status_name.lower()
+            for status in found["statuses"]:
+                if status["name"].lower() == wanted:
+                    return status["id"]
+        return None
+
+    def _find(self, name_or_id):
+        if isinstance(name_or_id, int):
+            return self._boards.get(name_or_id)
+        board_id = self._by_name.get(str(name_or_id).lower())
+        return self._boards.get(board_id)
+
+    def is_stale(self):
+        return time.time() - self._fetched_at > self.ttl
+
+    def stats(self):
+        with self._lock:
+            return {
+                "boards": len(self._boards),
+                "statuses": sum(len(b["statuses"]) for b in self._boards.values()),
+                "age_s": round(time.time() - self._fetched_at, 1) if self._fetched_at else None,
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+            }
+
+    # ---------------------------------------
+    # REFRESH
+    # ---------------------------------------
+    def refresh(self, force=False):
+        """
+        Reloads boards and statuses from the API if stale (or forced).
+        Returns True when new data was loaded.
+        """
+        if not force and not self.is_stale():
+            return False
+
+        with Timer() as t:
+            boards = self.api.get_boards()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix="board-statuses") as pool:
+                statuses = list(pool.map(lambda b: self.api.get_statuses(b["id"]), boards))
+
+        loaded = {
+            b["id"]: {
+                "id": b["id"],
+                "name": b["name"],
+                "statuses": [{"id": s["id"], "name": s["name"]} for s in board_statuses],
+            }
+            for b, board_statuses in zip(boards, statuses)
+        }
+
+        self._replace(loaded, time.time())
+        with self._lock:
+            self.refreshes += 1
+        log(f"Loaded {len(loaded)} boards", latency_ms=t.ms())
+
+        if self.path:
+            self.save()
+        return True
+
+    def refresh_async(self, on_ready=None, force=False):
+        """
+        refresh() on a background thread. `on_ready()` is called from that
+        thread only if new data was loaded; failures keep the current data.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                if self.refresh(force=force) and on_ready:
+                    on_ready()
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                warning(f"Board metadata refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _replace(self, boards, fetched_at):
+        with self._lock:
+            self._boards = boards
+            self._by_name = {b["name"].lower(): bid for bid, b in boards.items()}
+            self._fetched_at = fetched_at
+
+    # ---------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------
+    def save(self):
+        with self._lock:
+            data = {
+                "version": FORMAT_VERSION,
+                "fetched_at": self._fetched_at,
+                "boards": list(self._boards.values()),
+            }
+
+        # Its own temp file, so concurrent writers never share one
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".board_metadata.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self):
+        """Loads the saved copy, however old; refresh() decides if it is stale."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            return
+
+        boards = {}
+        for b in data.get("boards") or []:
+            board = _board(b)
+            if board is not None:
+                boards[board["id"]] = board
+
+        fetched_at = data.get("fetched_at")
+        if not isinstance(fetched_at, (int, float)):
+            fetched_at = 0.0
+
+        self._replace(boards, fetched_at)
+
+
+def _board(entry):
+    # A saved board, or None if the entry is malformed; bad statuses are dropped
+    try:
+        board = {"id": int(entry["id"]), "name": str(entry["name"]), "statuses": []}
+        statuses = entry.get("statuses") or []
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+    for s in statuses:
+        try:
+            board["statuses"].append({"id": int(s["id"]), "name": str(s["name"])})
+        except (KeyError, TypeError, ValueError):
+            continue
+    return board
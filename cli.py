@@ -0,0 +1,166 @@
+# cli.py
+"""
+Headless ticket export for cron jobs and scripts.
+
+    python cli.py --company ACME --status New --format csv -o new.csv
+    python cli.py --owner jdoe --order updated | jq .summary
+
+Credentials come from the environment (or a .env file when python-dotenv
+is installed): CONNECTWISE_USERNAME, CONNECTWISE_PASSWORD,
+CONNECTWISE_CLIENT_ID, and optionally CONNECTWISE_COMPANY,
+CONNECTWISE_SITE and CONNECTWISE_BASE_URL.
+
+Tickets are decoded and written one by one as each page downloads, so
+memory stays flat however many match. Nothing GUI-related is imported.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+ORDERS = {
+    "newest": "dateEntered desc",
+    "oldest": "dateEntered asc",
+    "updated": "lastUpdated desc",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export ConnectWise tickets as JSONL or CSV")
+    parser.add_argument("--company", help="company identifier")
+    parser.add_argument("--owner", help="owner identifier (partial match)")
+    parser.add_argument("--board", help="board name")
+    parser.add_argument("--status", help="status name")
+    parser.add_argument("--order", choices=ORDERS, default="newest")
+    parser.add_argument("--limit", type=int, help="stop after this many tickets (default: all)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--profile", choices=["list", "export"], default="list",
+                        help="which fields to request")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def build_client():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    missing = [name for name in ("CONNECTWISE_USERNAME", "CONNECTWISE_PASSWORD", "CONNECTWISE_CLIENT_ID")
+               if not os.getenv(name)]
+    if missing:
+        raise SystemExit(f"Missing environment variables: {', '.join(missing)}")
+
+    # Imported here so --help and argument errors don't pay for requests
+    from ConnectWiseApi import ConnectWiseAPIClient
+
+    return ConnectWiseAPIClient(
+        username=os.environ["CONNECTWISE_USERNAME"],
+        password=os.environ["CONNECTWISE_PASSWORD"],
+        client_id=os.environ["CONNECTWISE_CLIENT_ID"],
+        company=os.getenv("CONNECTWISE_COMPANY", "company"),
+        site=os.getenv("CONNECTWISE_SITE", "na"),
+        base_url=os.getenv("CONNECTWISE_BASE_URL")
+    )
+
+
+def _value(ticket, path):
+    # "owner/identifier" -> ticket["owner"]["identifier"]
+    value = ticket
+    for part in path.split("/"):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(part)
+    return "" if value is None else value
+
+
+def write_jsonl(tickets, out):
+    count = 0
+    for ticket in tickets:
+        out.write(json.dumps(ticket.to_dict(), separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def write_csv(tickets, out, columns):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+
+    count = 0
+    for ticket in tickets:
+        row = ticket.to_dict()
+        writer.writerow([_value(row, column) for column in columns])
+        count += 1
+    return count
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import requests
+
+    from log import configure
+    from projections import get_projection
+    from scheduler import CircuitOpenError
+    from timer import Timer
+
+    # stdout carries the data; keep log echo off it
+    configure(echo=False)
+
+    client = build_client()
+
+    from TicketService import TicketService
+    service = TicketService(client)
+
+    out = sys.stdout
+
+    try:
+        if args.output:
+            out = open(args.output, "w", newline="", encoding="utf-8")
+
+        with Timer() as t:
+            tickets = service.iter_unified_search(
+                company=args.company,
+                username=args.owner,
+                board=args.board,
+                status=args.status,
+                limit=args.limit,
+                page_size=args.page_size,
+                order_by=ORDERS[args.order],
+                profile=args.profile,
+                stream=True
+            )
+
+            if args.format == "csv":
+                columns = get_projection(args.profile).fields.split(",")
+                count = write_csv(tickets, out, columns)
+            else:
+                count = write_jsonl(tickets, out)
+
+            out.flush()
+
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); not an error
+        sys.stderr.close()
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except (requests.RequestException, CircuitOpenError, OSError) as e:
+        # Unreachable site, HTTP error, unwritable output file
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        client.close()
+
+    print(f"{count} tickets in {t.ms()} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
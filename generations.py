@@ -0,0 +1,63 @@
+# generations.py
+import itertools
+import threading
+
+
+class SearchGeneration:
+    """
+    One search started from the UI.
+
+    Workers poll `cancelled` between units of work and the UI drops any
+    callback whose generation is no longer current. Futures registered
+    with track() are cancelled along with the generation, so queued
+    follow-up work (e.g. notes fetches) never starts.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self._cancelled = threading.Event()
+        self._futures = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def track(self, futures):
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+            self._futures.extend(futures)
+        if self.cancelled:
+            self._cancel_futures()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._cancel_futures()
+
+    def _cancel_futures(self):
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.cancel()
+
+
+class SearchGenerations:
+    """Hands out search generations; starting one cancels the previous."""
+
+    def __init__(self):
+        self._numbers = itertools.count(1)
+        self._current = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            previous = self._current
+            self._current = SearchGeneration(next(self._numbers))
+            current = self._current
+
+        if previous is not None:
+            previous.cancel()
+        return current
+
+    def is_current(self, generation):
+        return generation is self._current and not generation.cancelled
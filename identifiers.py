@@ -0,0 +1,128 @@
+# identifiers.py
+import re
+import threading
+
+
+def _digits(value):
+    # "555-123 4567" -> "5551234567"; anything else is left alone
+    value = value.strip()
+    if re.fullmatch(r"[\d\s()+-]+", value):
+        return re.sub(r"\D", "", value)
+    return value
+
+
+def _mac(value):
+    # "00:aa:bb:cc:11:22" -> "00AABBCC1122"; anything else is left alone
+    value = value.strip()
+    hex_digits = re.sub(r"[:.\-]", "", value)
+    if len(hex_digits) == 12 and re.fullmatch(r"[0-9A-Fa-f]+", hex_digits):
+        return hex_digits.upper()
+    return value
+
+
+# label -> (pattern, normalizer); group 1 is the value
+DEFAULT_PATTERNS = {
+    "Equipment Ticket": (r"EQUIPMENTTICKET:\s*(\d+)", None),
+    "Mobility Ticket": (r"MOBILITY TICKET:\s*(\d+)", None),
+    "SIM ID": (r"SIM\s*1\s*ID:\s*([0-9]+)", None),
+    "TN": (r"TN:\s*([0-9]+)", _digits),
+    "IP Address": (r"IP Address:\s*([\d\.]+)", None),
+    "Subnet Mask": (r"Subnet Mask:\s*([\d\.]+)", None),
+    "Default Gateway": (r"Default Gateway:\s*([\d\.]+)", None),
+    "MAC Address": (r"Mac:\s*([0-9A-Fa-f]+)", _mac),
+}
+
+
+class IdentifierExtractor:
+    """
+    Pulls identifiers (IPs, MACs, SIM IDs, TNs, ticket numbers) out of
+    ticket descriptions with precompiled patterns, and keeps a reverse
+    index from each extracted value to the tickets it appeared in.
+    """
+
+    def __init__(self, patterns=None):
+        self._patterns = {}
+        self._by_value = {}     # normalized value -> {ticket ids}
+        self._by_label = {}     # (label, normalized value) -> {ticket ids}
+        self._lock = threading.Lock()
+
+        for label, (pattern, normalizer) in (patterns or DEFAULT_PATTERNS).items():
+            self.register(label, pattern, normalizer)
+
+    # ---------------------------------------
+    # PATTERN REGISTRY
+    # ---------------------------------------
+    def register(self, label, pattern, normalizer=None):
+        """
+        Adds (or replaces) a pattern. `pattern` must capture the value in
+        group 1; `normalizer` maps a raw value to its lookup form.
+        """
+        self._patterns[label] = (re.compile(pattern), normalizer or str.strip)
+
+    def unregister(self, label):
+        self._patterns.pop(label, None)
+
+    def labels(self):
+        return list(self._patterns)
+
+    # ---------------------------------------
+    # EXTRACTION
+    # ---------------------------------------
+    def extract(self, text):
+        """Returns {label: value} for the first match of each pattern."""
+        identifiers = {}
+        if not text:
+            return identifiers
+
+        for label, (regex, _) in self._patterns.items():
+            match = regex.search(text)
+            if match:
+                identifiers[label] = match.group(1)
+
+        return identifiers
+
+    def extract_many(self, items):
+        """
+        Batch extraction over (ticket_id, text) pairs; every result is
+        added to the reverse index.
+
+        Returns:
+            dict ticket_id -> {label: value}
+        """
+        results = {}
+        for ticket_id, text in items:
+            identifiers = self.extract(text)
+            results[ticket_id] = identifiers
+            self.index(ticket_id, identifiers)
+        return results
+
+    # ---------------------------------------
+    # REVERSE INDEX
+    # ---------------------------------------
+    def index(self, ticket_id, identifiers):
+        with self._lock:
+            for label, value in identifiers.items():
+                entry = self._patterns.get(label)
+                key = entry[1](value) if entry else value.strip()
+                self._by_value.setdefault(key, set()).add(ticket_id)
+                self._by_label.setdefault((label, key), set()).add(ticket_id)
+
+    def lookup(self, value, label=None):
+        """
+        Ticket ids whose descriptions contained `value`.
+
+        Without a label every registered normalizer is tried, so a MAC
+        typed with colons or a TN with dashes still matches.
+        """
+        value = value.strip()
+
+        with self._lock:
+            if label:
+                entry = self._patterns.get(label)
+                key = entry[1](value) if entry else value
+                return set(self._by_label.get((label, key), ()))
+
+            found = set(self._by_value.get(value, ()))
+            for label, (_, normalizer) in self._patterns.items():
+                found |= self._by_label.get((label, normalizer(value)), set())
+            return found
@@ -0,0 +1,101 @@
+# json_stream.py
+import codecs
+import json
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(chunks, compact_at=65536):
+    """
+    Yields the elements of a top-level JSON array as its bytes arrive.
+
+    `chunks` is any iterable of bytes (or str), e.g.
+    response.iter_content(). Each element is decoded with
+    JSONDecoder.raw_decode as soon as it is complete, and consumed text is
+    dropped from the buffer, so memory is bounded by roughly one element
+    plus one chunk rather than the whole body.
+
+    Raises:
+        ValueError: the stream is not a JSON array (missing or extra
+            commas, data after the closing bracket), or ends mid-element
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more():
+        nonlocal buf, pos, eof
+        for chunk in chunks:
+            text = utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                # Drop consumed text once it is worth the copy
+                if pos >= compact_at:
+                    buf, pos = buf[pos:], 0
+                buf += text
+                return True
+        buf += utf8.decode(b"", final=True)
+        eof = True
+        return False
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or not more():
+                return
+
+    skip(_WHITESPACE)
+    if pos >= len(buf) or buf[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    skip(_WHITESPACE)
+    if pos < len(buf) and buf[pos] == "]":
+        pos += 1
+    else:
+        while True:
+            # An element, then exactly one ',' before the next or the closing ']'
+            skip(_WHITESPACE)
+            if pos >= len(buf):
+                raise ValueError("JSON array ended unexpectedly")
+            if buf[pos] in ",]":
+                raise ValueError(f"Expected a value in JSON array, got {buf[pos]!r}")
+
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Most likely an element cut off mid-chunk; wait for more
+                    if eof or not more():
+                        raise ValueError("JSON array ended mid-element") from None
+                    continue
+
+                # A number is only complete once a delimiter follows it: "1." or
+                # "1e" at the end of a chunk decodes as a shorter number
+                if (not eof and not isinstance(item, (dict, list, str))
+                        and (end == len(buf) or buf[end] not in _WHITESPACE + ",]")):
+                    if more():
+                        continue
+
+                pos = end
+                yield item
+                break
+
+            skip(_WHITESPACE)
+            if pos >= len(buf):
+                raise ValueError("JSON array ended unexpectedly")
+            sep = buf[pos]
+            pos += 1
+            if sep == "]":
+                break
+            if sep != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {sep!r}")
+
+    skip(_WHITESPACE)
+    if pos < len(buf):
+        raise ValueError("Unexpected data after the JSON array")
@@ -1,8 +1,196 @@
 # log.py
+import atexit
 import datetime
+import itertools
+import json
+import os
+import queue
+import threading
+import time
 
-def log(message):
-    ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open("app.log", "a", encoding="utf-8") as f:
-        f.write(f"[{ts}] {message}\n")
-    print(message)
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+_request_ids = itertools.count(1)
+
+
+class AsyncLogger:
+    """
+    Queue-backed JSON-lines logger.
+
+    Callers only build a record and enqueue it; a background thread
+    batches records to disk, echoes them to the console and rotates the
+    file by size and/or age. When the queue is full records are dropped
+    (and counted) rather than blocking the caller.
+    """
+
+    def __init__(self, path="app.log", level="INFO", max_bytes=5 * 1024 * 1024,
+                 backups=3, rotate_interval=None, flush_interval=0.5,
+                 batch_size=200, queue_size=10000, echo=True, payloads=False):
+        self.path = path
+        self.level = LEVELS[level]
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rotate_interval = rotate_interval
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.echo = echo
+        self.payloads = payloads
+
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._opened_at = time.time()
+
+    # ---------------------------------------
+    # PRODUCER SIDE (hot path)
+    # ---------------------------------------
+    def is_enabled(self, level):
+        return LEVELS[level] >= self.level
+
+    def log(self, message, level="INFO", **fields):
+        if LEVELS[level] < self.level:
+            return
+
+        record = {
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "level": level,
+            "msg": message,
+        }
+        record.update(fields)
+
+        if self._thread is None:
+            self._start()
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=2.0):
+        """Blocks until everything enqueued so far is on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    # ---------------------------------------
+    # WRITER THREAD
+    # ---------------------------------------
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            records = [r for r in batch if isinstance(r, dict)]
+            if records:
+                try:
+                    self._write(records)
+                except OSError:
+                    self.dropped += len(records)
+
+            for marker in batch:
+                if isinstance(marker, threading.Event):
+                    marker.set()
+
+    def _write(self, records):
+        lines = "".join(json.dumps(r, default=str) + "\n" for r in records)
+
+        if self._should_rotate(len(lines)):
+            self._rotate()
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+        if self.echo:
+            for r in records:
+                print(r["msg"])
+
+    def _should_rotate(self, incoming):
+        if self.rotate_interval and time.time() - self._opened_at >= self.rotate_interval:
+            return True
+        try:
+            return os.path.getsize(self.path) + incoming > self.max_bytes
+        except OSError:
+            return False
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if os.path.exists(self.path):
+            if self.backups:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        self._opened_at = time.time()
+
+
+_logger = AsyncLogger()
+
+
+def configure(**settings):
+    """
+    Adjusts the shared logger, e.g. configure(level="DEBUG", payloads=True).
+    Accepts the AsyncLogger constructor arguments.
+    """
+    for name, value in settings.items():
+        if name == "level":
+            value = LEVELS[value]
+        if not hasattr(_logger, name):
+            raise ValueError(f"Unknown log setting '{name}'")
+        setattr(_logger, name, value)
+
+
+def log(message, level="INFO", **fields):
+    _logger.log(message, level, **fields)
+
+
+def debug(message, **fields):
+    _logger.log(message, "DEBUG", **fields)
+
+
+def warning(message, **fields):
+    _logger.log(message, "WARNING", **fields)
+
+
+def error(message, **fields):
+    _logger.log(message, "ERROR", **fields)
+
+
+def is_enabled(level):
+    return _logger.is_enabled(level)
+
+
+def payloads_enabled():
+    """Whether verbose payload dumps (full ticket JSON etc.) are wanted."""
+    return _logger.payloads
+
+
+def new_request_id():
+    return f"{os.getpid():x}-{next(_request_ids):06d}"
+
+
+def flush(timeout=2.0):
+    _logger.flush(timeout)
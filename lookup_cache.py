@@ -0,0 +1,170 @@
+# lookup_cache.py
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from log import warning
+
+
+class LookupCache:
+    """
+    Bounded TTL/LRU cache for identifier → id lookups (companies, sites).
+
+    "Not found" answers are cached too (with their own, shorter TTL) so a
+    mistyped company does not cost a round trip on every retry. When `path`
+    is given the cache is loaded from that JSON file and written back by a
+    background timer, at most every `save_interval` seconds while it
+    changes, and at exit; callers never wait on the disk.
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_entries=512, ttl=3600, negative_ttl=300, path=None,
+                 save_interval=5):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+        self.save_interval = save_interval
+
+        self._entries = OrderedDict()   # key -> (expires_at, value or None)
+        self._lock = threading.Lock()
+        self._save_lock = threading.RLock()
+        self._dirty = False
+        self._saved_at = 0.0
+        self._save_timer = None
+
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+        if self.path:
+            self.load()
+            atexit.register(self.flush)
+
+    # ---------------------------------------
+    # LOOKUPS
+    # ---------------------------------------
+    def get(self, key):
+        """
+        Returns the cached value, None for a cached "not found",
+        or LookupCache.MISSING when the key has to be fetched.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return self.MISSING
+
+            self._entries.move_to_end(key)
+            if entry[1] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        self._store(key, value, self.ttl)
+
+    def put_missing(self, key):
+        self._store(key, None, self.negative_ttl)
+
+    def _store(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            if self.path and self._save_timer is None:
+                delay = max(0.0, self.save_interval - (time.monotonic() - self._saved_at))
+                self._save_timer = threading.Timer(delay, self._save_in_background)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+            }
+
+    # ---------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------
+    def flush(self):
+        """Saves now if anything changed since the last save."""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer:
+            timer.cancel()
+        # Waits for a background save already under way
+        with self._save_lock:
+            if self.path and self._dirty:
+                self.save()
+
+    def _save_in_background(self):
+        with self._lock:
+            if self._save_timer is threading.current_thread():
+                self._save_timer = None
+        try:
+            with self._save_lock:
+                # flush() may have got there first
+                if self._dirty:
+                    self.save()
+        except OSError as e:
+            # Still dirty: the next change or flush() tries again
+            warning(f"Lookup cache save failed: {e}")
+
+    def save(self):
+        # One writer at a time, each through its own temp file
+        with self._save_lock:
+            with self._lock:
+                rows = [[list(k), exp, v] for k, (exp, v) in self._entries.items()]
+                self._dirty = False
+                self._saved_at = time.monotonic()
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".lookup_cache.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(rows, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                self._dirty = True
+                raise
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, expires_at, value in rows:
+                if expires_at >= now:
+                    self._entries[tuple(key)] = (expires_at, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,207 @@
+# metrics.py
+import json
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from timer import Timer
+
+# Upper bounds (ms) of the Prometheus histogram buckets
+BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_name(method, path):
+    """'GET /service/tickets/123/notes' -> 'GET /service/tickets/{id}/notes'"""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class Histogram:
+    """
+    Latency distribution: exact count/sum/bucket counts plus a bounded
+    window of recent samples for percentiles.
+    """
+
+    def __init__(self, window=2048):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self._samples = deque(maxlen=window)
+
+    def observe(self, ms):
+        self.count += 1
+        self.total += ms
+        self._samples.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, p):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.server = Histogram()
+        self.statuses = {}
+        self.bytes = 0
+        self.retries = 0
+
+
+class MetricsRegistry:
+    """
+    Per-endpoint request metrics plus named timings, built on Timer.
+
+    The API client records every request (endpoint, status, latency,
+    time to response headers, bytes, retries); UI code can time its own
+    work with `timed(name)`. Caches and other components register a
+    stats() callable as a source, so their hit counters show up in the
+    same snapshot. Exportable as JSON or Prometheus text.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._timings = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------
+    # RECORDING
+    # ---------------------------------------
+    def record_request(self, method, path, status, latency_ms, server_ms=None,
+                       size=0, retries=0):
+        """`status` is the HTTP status code, or "error" if nothing came back."""
+        name = endpoint_name(method, path)
+
+        with self._lock:
+            stats = self._endpoints.setdefault(name, _EndpointStats())
+            stats.latency.observe(latency_ms)
+            if server_ms is not None:
+                stats.server.observe(server_ms)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes += size
+            stats.retries += retries
+
+    def record_bytes(self, method, path, size):
+        """Adds body bytes read after record_request (streamed responses)."""
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint_name(method, path), _EndpointStats())
+            stats.bytes += size
+
+    def observe(self, name, ms):
+        with self._lock:
+            self._timings.setdefault(name, Histogram()).observe(ms)
+
+    @contextmanager
+    def timed(self, name):
+        """with metrics.timed("render.chunk"): ..."""
+        with Timer() as t:
+            yield t
+        self.observe(name, t.ms())
+
+    def add_source(self, name, stats_fn):
+        """Includes stats_fn() (a dict of numbers) in every snapshot."""
+        with self._lock:
+            self._sources[name] = stats_fn
+
+    # ---------------------------------------
+    # EXPORT
+    # ---------------------------------------
+    def snapshot(self):
+        with self._lock:
+            endpoints = {
+                name: dict(
+                    s.latency.summary(),
+                    server_p50_ms=s.server.percentile(50),
+                    server_p95_ms=s.server.percentile(95),
+                    statuses={str(k): v for k, v in s.statuses.items()},
+                    bytes=s.bytes,
+                    retries=s.retries,
+                )
+                for name, s in self._endpoints.items()
+            }
+            timings = {name: h.summary() for name, h in self._timings.items()}
+            sources = dict(self._sources)
+
+        return {
+            "endpoints": endpoints,
+            "timings": timings,
+            "sources": {name: fn() for name, fn in sources.items()},
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        lines = []
+
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+            timings = list(self._timings.items())
+            sources = dict(self._sources)
+
+            lines.append("# TYPE connectwise_request_duration_ms histogram")
+            for name, s in endpoints:
+                lines.extend(_histogram_lines(
+                    "connectwise_request_duration_ms", f'endpoint="{name}"', s.latency
+                ))
+
+            lines.append("# TYPE connectwise_requests_total counter")
+            for name, s in endpoints:
+                for status, count in s.statuses.items():
+                    lines.append(
+                        f'connectwise_requests_total{{endpoint="{name}",status="{status}"}} {count}'
+                    )
+
+            lines.append("# TYPE connectwise_response_bytes_total counter")
+            for name, s in endpoints:
+                lines.append(f'connectwise_response_bytes_total{{endpoint="{name}"}} {s.bytes}')
+
+            lines.append("# TYPE connectwise_retries_total counter")
+            for name, s in endpoints:
+                lines.append(f'connectwise_retries_total{{endpoint="{name}"}} {s.retries}')
+
+            lines.append("# TYPE app_duration_ms histogram")
+            for name, h in timings:
+                lines.extend(_histogram_lines("app_duration_ms", f'name="{name}"', h))
+
+        lines.append("# TYPE component_stat gauge")
+        for source, fn in sources.items():
+            for key, value in fn().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'component_stat{{source="{source}",stat="{key}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._timings.clear()
+
+
+def _histogram_lines(metric, labels, histogram):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS_MS, histogram.buckets):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{metric}_sum{{{labels}}} {round(histogram.total, 2)}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
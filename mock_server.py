@@ -0,0 +1,325 @@
+# mock_server.py
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+API_PREFIX = "/v4_6_release/apis/3.0"
+
+BOARDS = {
+    1: ("MNS Config", ["New", "Assigned", "Ready to Configure", "Closed"]),
+    2: ("MNS Activations", ["Open", "Scheduled", "Success", "Fail"]),
+}
+
+COMPANIES = [
+    {"id": 100 + i, "identifier": f"Company{i}", "name": f"Company {i} Inc"}
+    for i in range(10)
+]
+
+OWNERS = [f"tech{i}" for i in range(8)]
+
+
+class MockConfig:
+    """
+    Knobs for the mock ConnectWise API.
+
+    Args:
+        tickets (int): number of tickets in the dataset
+        description_bytes (int): approximate size of each initial description
+        latency_ms (float): added to every response
+        jitter_ms (float): uniform random extra latency
+        max_page_size (int): pageSize is capped at this, like ConnectWise
+        throttle_every (int): every Nth request gets a 429 (0 = never)
+        retry_after (float): Retry-After seconds sent with injected 429s
+        seed (int): dataset seed, so runs are comparable
+    """
+
+    def __init__(self, tickets=2000, description_bytes=600, latency_ms=20, jitter_ms=0,
+                 max_page_size=1000, throttle_every=0, retry_after=0.1, seed=1):
+        self.tickets = tickets
+        self.description_bytes = description_bytes
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.max_page_size = max_page_size
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.seed = seed
+
+
+def build_dataset(config):
+    rng = random.Random(config.seed)
+    tickets = []
+
+    for i in range(config.tickets):
+        board_id = rng.choice(list(BOARDS))
+        board_name, statuses = BOARDS[board_id]
+        company = rng.choice(COMPANIES)
+        tickets.append({
+            "id": 1000 + i,
+            "summary": f"Ticket {i} for {company['name']}",
+            "owner": {"identifier": rng.choice(OWNERS)},
+            "board": {"id": board_id, "name": board_name},
+            "status": {"name": rng.choice(statuses)},
+            "company": {"id": company["id"], "identifier": company["identifier"],
+                        "name": company["name"]},
+            "team": {"name": "Provisioning"},
+            "_info": {"lastUpdated": f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"},
+        })
+
+    return tickets
+
+
+def description_for(ticket_id, size):
+    header = (
+        f"EQUIPMENTTICKET: {ticket_id}\n"
+        f"SIM 1 ID: 8901{ticket_id:012d}\n"
+        f"TN: 555-{ticket_id % 1000:03d}-{ticket_id % 10000:04d}\n"
+        f"IP Address: 10.{ticket_id % 255}.0.1\n"
+        f"Mac: 00AABB{ticket_id % 0xFFFFFF:06X}\n"
+    )
+    filler = "Customer reported the device is offline after the move. "
+    padding = max(0, size - len(header))
+    return header + (filler * (padding // len(filler) + 1))[:padding]
+
+
+_TERM = re.compile(
+    r"""([\w/]+)\s*(=|contains|>=|<=|>|<|in\b)\s*("(?:[^"\\]|\\.)*"|'[^']*'|\[[^\]]*\]|\([^)]*\)|[\w.-]+)"""
+)
+
+
+def _field(ticket, path):
+    if path == "lastUpdated":
+        path = "_info/lastUpdated"
+    obj = ticket
+    for part in path.split("/"):
+        obj = obj.get(part) if isinstance(obj, dict) else None
+    return "" if obj is None or isinstance(obj, dict) else str(obj)
+
+
+def _term_matches(ticket, term):
+    m = _TERM.search(term)
+    if not m:
+        return True
+    field, op, value = m.groups()
+    actual = _field(ticket, field)
+
+    if op == "in":
+        return actual in {v.strip().strip("\"'") for v in value.strip("()").split(",")}
+
+    if value.startswith('"'):
+        value = re.sub(r"\\(.)", r"\1", value[1:-1])
+    else:
+        value = value.strip("'[]")
+
+    # String comparisons are case-insensitive, as on ConnectWise
+    if op == "contains":
+        return value.lower() in actual.lower()
+    if op == "=":
+        return actual.lower() == value.lower()
+    # Range operators (e.g. lastUpdated) compare as strings, like ISO dates
+    return {">=": actual >= value, "<=": actual <= value,
+            ">": actual > value, "<": actual < value}[op]
+
+
+def _matches(ticket, conditions):
+    """
+    Evaluates the condition strings the app sends: clauses joined by AND,
+    each optionally a parenthesised group of OR-ed terms.
+    """
+    if not conditions:
+        return True
+
+    for clause in re.split(r"\s+AND\s+", conditions, flags=re.IGNORECASE):
+        clause = clause.strip()
+        if clause.startswith("(") and clause.endswith(")"):
+            clause = clause[1:-1]
+        terms = re.split(r"\s+OR\s+", clause, flags=re.IGNORECASE)
+        if not any(_term_matches(ticket, term) for term in terms):
+            return False
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.mock.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.mock.handle(self, "POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections (or abandoning a
+        # streamed page) are expected here, not worth a traceback
+        pass
+
+
+class MockConnectWiseServer:
+    """
+    Local stand-in for the ConnectWise endpoints the app uses: tickets
+    (paged, filtered, count), notes, companies/sites, boards/statuses
+    and ticket creation. Runs on a background thread:
+
+        with MockConnectWiseServer(MockConfig(latency_ms=50)) as server:
+            client = ConnectWiseAPIClient(..., base_url=server.base_url)
+    """
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.tickets = build_dataset(self.config)
+        self._by_id = {t["id"]: t for t in self.tickets}
+
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def update_ticket(self, ticket_id, **changes):
+        """Edits a ticket as a user would, bumping its lastUpdated."""
+        now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with self._lock:
+            ticket = self._by_id[ticket_id]
+            ticket.update(changes)
+            ticket["_info"] = dict(ticket.get("_info") or {}, lastUpdated=now)
+        return ticket
+
+    # ---------------------------------------
+    # REQUEST HANDLING
+    # ---------------------------------------
+    def handle(self, handler, method):
+        config = self.config
+
+        # Always consume the body so keep-alive connections stay in sync
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+
+        with self._lock:
+            self.requests += 1
+            throttle = config.throttle_every and self.requests % config.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+
+        delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if throttle:
+            self._send(handler, 429, {"message": "Too many requests"},
+                       {"Retry-After": str(config.retry_after)})
+            return
+
+        url = urlparse(handler.path)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if method == "POST":
+            if path == "/service/tickets":
+                payload = json.loads(raw or b"{}")
+                with self._lock:
+                    payload["id"] = 1000 + len(self.tickets)
+                    self.tickets.append(payload)
+                    self._by_id[payload["id"]] = payload
+                self._send(handler, 201, payload)
+            else:
+                self._send(handler, 404, {"message": "Not found"})
+            return
+
+        status, body = self._route(path, query)
+        self._send(handler, status, body)
+
+    def _route(self, path, query):
+        conditions = query.get("conditions")
+
+        if path == "/service/tickets":
+            matching = [t for t in self.tickets if _matches(t, conditions)]
+            if order := query.get("orderBy", "").split():
+                matching.sort(key=lambda t: _field(t, order[0]),
+                              reverse=order[-1].lower() == "desc")
+            page = int(query.get("page", 1))
+            size = min(int(query.get("pageSize", 25)), self.config.max_page_size)
+            return 200, matching[(page - 1) * size:page * size]
+
+        if path == "/service/tickets/count":
+            return 200, {"count": sum(1 for t in self.tickets if _matches(t, conditions))}
+
+        if m := re.fullmatch(r"/service/tickets/(\d+)/notes", path):
+            tid = int(m.group(1))
+            if tid not in self._by_id:
+                return 404, {"message": "Ticket not found"}
+            return 200, [
+                {"id": tid * 10, "ticketId": tid, "detailDescriptionFlag": True,
+                 "text": description_for(tid, self.config.description_bytes)},
+                {"id": tid * 10 + 1, "ticketId": tid, "internalAnalysisFlag": True,
+                 "text": "Checked provisioning."},
+            ]
+
+        if m := re.fullmatch(r"/service/tickets/(\d+)", path):
+            ticket = self._by_id.get(int(m.group(1)))
+            if ticket is None:
+                return 404, {"message": "Ticket not found"}
+            return 200, dict(ticket, initialDescription=description_for(
+                ticket["id"], self.config.description_bytes))
+
+        if path == "/company/companies":
+            return 200, [c for c in COMPANIES if _matches(c, conditions)]
+
+        if m := re.fullmatch(r"/company/companies/(\d+)/sites", path):
+            return 200, [{"id": int(m.group(1)) * 10, "name": "Main"}]
+
+        if path == "/service/boards":
+            return 200, [{"id": bid, "name": name} for bid, (name, _) in BOARDS.items()]
+
+        if m := re.fullmatch(r"/service/boards/(\d+)/statuses", path):
+            board = BOARDS.get(int(m.group(1)))
+            if board is None:
+                return 404, {"message": "Board not found"}
+            return 200, [{"id": i + 1, "name": name} for i, name in enumerate(board[1])]
+
+        return 404, {"message": f"Unknown endpoint {path}"}
+
+    @staticmethod
+    def _send(handler, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
@@ -0,0 +1,43 @@
+# projections.py
+
+
+class Projection:
+    """A named fields/expand pair for /service/tickets requests."""
+
+    def __init__(self, name, fields, expand=None):
+        self.name = name
+        self.fields = fields
+        self.expand = expand
+
+
+_LIST_FIELDS = (
+    "id,summary,owner/identifier,status/name,board/name,team/name,"
+    "company/name,company/identifier,_info/lastUpdated"
+)
+
+PROFILES = {
+    # What result lists render: no text bodies, no expansions
+    "list": Projection("list", _LIST_FIELDS),
+
+    # A single opened ticket, with its text and notes
+    "detail": Projection(
+        "detail",
+        _LIST_FIELDS + ",description,initialDescription,internalAnalysis,resolution,notes",
+        expand="owner,company,board,notes"
+    ),
+
+    # Flat rows for CSV/JSONL export
+    "export": Projection(
+        "export",
+        _LIST_FIELDS + ",priority/name,contact/name,dateEntered,closedDate,"
+        "initialDescription,internalAnalysis,resolution"
+    ),
+}
+
+
+def get_projection(profile):
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown projection profile '{profile}' "
+                         f"(expected one of {', '.join(PROFILES)})")
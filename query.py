@@ -0,0 +1,181 @@
+# query.py
+from datetime import date, datetime
+
+
+def literal(value):
+    """
+    A value as it is written in a ConnectWise conditions string:
+    strings quoted (with \\ and " escaped, whitespace collapsed),
+    numbers bare, booleans true/false, datetimes in [brackets].
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime):
+        return f"[{value.strftime('%Y-%m-%dT%H:%M:%SZ')}]"
+    if isinstance(value, date):
+        return f"[{value.isoformat()}]"
+
+    text = " ".join(str(value).split())
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class Query:
+    """
+    Composable conditions for ConnectWise list endpoints.
+
+    Every filter is pushed into one server-side expression; clauses are
+    AND-ed, any_of() OR-s a group. Values are normalised and escaped
+    here, so callers never format conditions by hand. Clauses are kept
+    sorted and de-duplicated, so the same filters built in any order give
+    the same string (and so the same result-cache key).
+
+        Query().company("ACME").owner("jdoe").status("New")
+        -> 'company/identifier="ACME" AND owner/identifier contains "jdoe" AND status/name="New"'
+
+    A Query can be passed anywhere a conditions string is accepted; an
+    empty one means "no conditions". Builders change the Query in place,
+    so it is not hashable; use key() as a dict key.
+    """
+
+    def __init__(self, clauses=()):
+        self._clauses = set(clauses)
+
+    # ---------------------------------------
+    # BUILDING
+    # ---------------------------------------
+    def where(self, field, op, value):
+        """Adds `field op value`; blank strings and None are skipped."""
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return self
+        sep = "=" if op == "=" else f" {op} "
+        return self._add(f"{field}{sep}{literal(value)}")
+
+    def equals(self, field, value):
+        return self.where(field, "=", value)
+
+    def contains(self, field, value):
+        # 'contains' ignores case server-side; lowercase so keys match too
+        if isinstance(value, str):
+            value = value.lower()
+        return self.where(field, "contains", value)
+
+    def one_of(self, field, values):
+        """`field in (a, b, ...)`"""
+        values = sorted(set(values), key=str)
+        if not values:
+            raise ValueError(f"one_of({field!r}) needs at least one value")
+        return self._add(f"{field} in ({','.join(literal(v) for v in values)})")
+
+    def updated_since(self, timestamp, inclusive=True):
+        """lastUpdated >= [timestamp] (or > with inclusive=False)."""
+        if not timestamp:
+            return self
+        op = ">=" if inclusive else ">"
+        if isinstance(timestamp, (date, datetime)):
+            stamp = literal(timestamp)
+        else:
+            stamp = f"[{timestamp}]"
+        return self._add(f"lastUpdated {op} {stamp}")
+
+    def any_of(self, *queries):
+        """OR-s the given queries together as one clause."""
+        parts = sorted({q.conditions() for q in queries if q})
+        if not parts:
+            return self
+        if len(parts) == 1:
+            return self.raw(next(q for q in queries if q))
+        return self._add("(" + " OR ".join(f"({p})" if " AND " in p else p for p in parts) + ")")
+
+    def raw(self, conditions):
+        """
+        Adds a conditions string (or another Query's clauses). A string is
+        always parenthesised as one clause, so an `or` inside it (in any
+        case) can never escape the other filters.
+        """
+        if isinstance(conditions, Query):
+            self._clauses |= conditions._clauses
+            return self
+        if conditions and conditions.strip():
+            text = " ".join(conditions.split())
+            self._add(text if _wrapped(text) else f"({text})")
+        return self
+
+    # ---------------------------------------
+    # TICKET FILTERS
+    # ---------------------------------------
+    def company(self, company):
+        """By id (int) or identifier, with no lookup request needed."""
+        if isinstance(company, int):
+            return self.equals("company/id", company)
+        return self.equals("company/identifier", company)
+
+    def company_like(self, text):
+        """Partial match on company name or identifier."""
+        if not text or not text.strip():
+            return self
+        return self.any_of(Query().contains("company/name", text),
+                           Query().contains("company/identifier", text))
+
+    def owner(self, username):
+        # ConnectWise 'contains' handles partial matches & case insensitivity
+        return self.contains("owner/identifier", username)
+
+    def board(self, board):
+        if isinstance(board, int):
+            return self.equals("board/id", board)
+        return self.equals("board/name", board)
+
+    def status(self, status):
+        return self.equals("status/name", status)
+
+    @classmethod
+    def tickets(cls, company=None, owner=None, board=None, status=None):
+        return cls().company(company).owner(owner).board(board).status(status)
+
+    # ---------------------------------------
+    # OUTPUT
+    # ---------------------------------------
+    def conditions(self):
+        """The conditions string, or None when there are no filters."""
+        return " AND ".join(sorted(self._clauses)) or None
+
+    def key(self):
+        """Stable cache key (a string)."""
+        return self.conditions() or ""
+
+    def copy(self):
+        return Query(self._clauses)
+
+    def _add(self, clause):
+        self._clauses.add(clause)
+        return self
+
+    def __bool__(self):
+        return bool(self._clauses)
+
+    def __str__(self):
+        return self.key()
+
+    def __repr__(self):
+        return f"Query({self.key()!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and self._clauses == other._clauses
+
+    # Mutable: equal now does not mean equal later
+    __hash__ = None
+
+
+def _wrapped(text):
+    # True if the outer parentheses enclose the whole expression
+    if not (text.startswith("(") and text.endswith(")")):
+        return False
+    depth = 0
+    for i, ch in enumerate(text):
+        depth += ch == "("
+        depth -= ch == ")"
+        if depth == 0 and i < len(text) - 1:
+            return False
+    return True
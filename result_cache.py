@@ -0,0 +1,121 @@
+# result_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_key(params):
+    """
+    Stable cache key for a /service/tickets request.
+
+    Whitespace in conditions/orderBy is collapsed and the comma lists in
+    fields/expand are sorted, so equivalent requests share an entry.
+    """
+    def _collapse(value):
+        return " ".join(str(value).split()) if value is not None else None
+
+    def _sorted_list(value):
+        if not value:
+            return None
+        return ",".join(sorted(part.strip() for part in value.split(",") if part.strip()))
+
+    return (
+        _collapse(params.get("conditions")),
+        _collapse(params.get("orderBy")).lower() if params.get("orderBy") else None,
+        _sorted_list(params.get("fields")),
+        _sorted_list(params.get("expand")),
+        params.get("page"),
+        params.get("pageSize"),
+    )
+
+
+def page_signature(tickets):
+    """What revalidation compares: ids in order plus their lastUpdated."""
+    return [
+        (t.get("id"), (t.get("_info") or {}).get("lastUpdated") or t.get("lastUpdated"))
+        for t in tickets
+    ]
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of ticket pages.
+
+    Entries are served immediately; the client revalidates them in the
+    background once they are older than `revalidate_after` seconds.
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_entries=64, revalidate_after=5):
+        self.max_entries = max_entries
+        self.revalidate_after = revalidate_after
+
+        self._entries = OrderedDict()   # key -> (stored_at, tickets)
+        self._revalidating = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.updates = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return self.MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, tickets):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tickets)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        """Marks an entry as freshly validated without replacing it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (time.monotonic(), entry[1])
+
+    def begin_revalidation(self, key):
+        """
+        True when `key` is stale enough to revalidate and nobody else is
+        already doing it; the caller must then call end_revalidation().
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or key in self._revalidating:
+                return False
+            if time.monotonic() - entry[0] < self.revalidate_after:
+                return False
+            self._revalidating.add(key)
+            self.revalidations += 1
+            return True
+
+    def end_revalidation(self, key, updated=False):
+        with self._lock:
+            self._revalidating.discard(key)
+            if updated:
+                self.updates += 1
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "updates": self.updates,
+            }
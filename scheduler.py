@@ -0,0 +1,292 @@
+# scheduler.py
+import email.utils
+import random
+import threading
+import time
+
+import requests
+
+# Safe to resend after a failure; POST is only retried on 429, which
+# means the server rejected it before doing anything.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending while the circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, up to `capacity`
+    (default max(1, rate)). With rate=None there is no limit; only pause()
+    holds callers back.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self.limit(rate, capacity)
+
+    def limit(self, rate, capacity=None):
+        """Sets new limits, starting from a full bucket."""
+        if rate is not None and capacity is None:
+            capacity = max(1, rate)
+        with self._lock:
+            self.rate = rate
+            self.capacity = capacity
+            self._tokens = capacity
+            self._updated = time.monotonic()
+
+    def _refill(self, now):
+        if self.rate is None:
+            return
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Blocks until a token is available (and any 429 pause is over)."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self.rate is None:
+                    return
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Holds every caller back for `seconds` (server asked us to)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+    def state(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": None if self.rate is None else round(self._tokens, 2),
+                "paused_for": round(max(0.0, self._blocked_until - now), 2),
+            }
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures, fails fast for
+    `reset_timeout` seconds, then lets a single trial request through.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                name = "closed"
+            elif time.monotonic() - self._opened_at < self.reset_timeout:
+                name = "open"
+            else:
+                name = "half-open"
+            return {"state": name, "consecutive_failures": self._failures}
+
+
+class RequestScheduler:
+    """
+    Central gate every ConnectWise request goes through.
+
+    Each request takes a token from the client's bucket and from the
+    bucket shared by every client talking to the same site. Neither has a
+    rate limit unless one is configured (ConnectWise publishes no fixed
+    quota); a 429 pauses both for its Retry-After, so the client slows
+    down exactly as much as the server asks. 429 and 5xx responses and
+    connection errors are retried with jittered exponential backoff, and
+    a circuit breaker stops hammering a site that keeps failing.
+    """
+
+    _site_buckets = {}
+    _site_lock = threading.Lock()
+
+    def __init__(self, site, rate=None, burst=None, site_rate=None, site_burst=None,
+                 max_retries=4, backoff_base=0.5, backoff_max=30, breaker=None):
+        self.site = site
+        self.bucket = TokenBucket(rate, burst)
+        self.site_bucket = self._bucket_for_site(site, site_rate, site_burst)
+        self.breaker = breaker or CircuitBreaker()
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.throttled = 0
+
+    @classmethod
+    def _bucket_for_site(cls, site, rate, burst):
+        # The first client to name limits for a site sets them; later ones
+        # may leave them out but not ask for different ones
+        with cls._site_lock:
+            bucket = cls._site_buckets.get(site)
+            if bucket is None:
+                bucket = cls._site_buckets[site] = TokenBucket(rate, burst)
+                return bucket
+            if rate is None:
+                return bucket
+            if bucket.rate is None:
+                # Shared with clients already using it, so limited in place
+                bucket.limit(rate, burst)
+                return bucket
+
+            wanted = TokenBucket(rate, burst)
+            if (wanted.rate, wanted.capacity) != (bucket.rate, bucket.capacity):
+                raise ValueError(
+                    f"Site '{site}' already limited to rate={bucket.rate}, burst={bucket.capacity}; "
+                    f"got rate={rate}, burst={burst}"
+                )
+            return bucket
+
+    # ---------------------------------------
+    # EXECUTION
+    # ---------------------------------------
+    def execute(self, method, send, on_retry=None):
+        """
+        Runs `send()` (which performs one HTTP request) under the rate
+        limits, retrying as allowed. Returns the final response; raising
+        for its status is left to the caller. `on_retry()` is called
+        before each retry.
+        """
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for site '{self.site}'; not sending {method}")
+
+            self.bucket.acquire()
+            self.site_bucket.acquire()
+
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout):
+                self.breaker.record_failure()
+                if method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt, on_retry=on_retry)
+                attempt += 1
+                continue
+            except BaseException:
+                # Anything else (e.g. a broken chunked body) still ends a
+                # half-open trial; otherwise the breaker never closes again
+                self.breaker.record_failure()
+                raise
+
+            status = response.status_code
+
+            if status == 429:
+                # Throttling is not a fault of the site; don't trip the breaker
+                self.breaker.record_success()
+                delay = self._retry_after(response) or self._backoff(attempt)
+                with self._lock:
+                    self.throttled += 1
+                self.bucket.pause(delay)
+                self.site_bucket.pause(delay)
+
+                if attempt >= self.max_retries:
+                    return response
+                response.close()
+                self._count_retry(on_retry)
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if status >= 500:
+                self.breaker.record_failure()
+                if method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+                    return response
+                response.close()
+                self._sleep_before_retry(attempt, self._retry_after(response), on_retry)
+                attempt += 1
+                continue
+
+            self.breaker.record_success()
+            return response
+
+    def _count_retry(self, on_retry=None):
+        with self._lock:
+            self.retries += 1
+        if on_retry:
+            on_retry()
+
+    def _sleep_before_retry(self, attempt, delay=None, on_retry=None):
+        self._count_retry(on_retry)
+        time.sleep(delay if delay is not None else self._backoff(attempt))
+
+    def _backoff(self, attempt):
+        # "Full jitter": spreads retries of concurrent callers apart
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after(response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    # ---------------------------------------
+    # STATE
+    # ---------------------------------------
+    def state(self):
+        with self._lock:
+            counters = {"retries": self.retries, "throttled": self.throttled}
+        return {
+            "client_bucket": self.bucket.state(),
+            "site_bucket": self.site_bucket.state(),
+            "breaker": self.breaker.state(),
+            **counters,
+        }
@@ -0,0 +1,41 @@
+# tests/conftest.py
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ConnectWiseApi import ConnectWiseAPIClient  # noqa: E402
+from log import configure  # noqa: E402
+from mock_server import MockConfig, MockConnectWiseServer  # noqa: E402
+from scheduler import RequestScheduler  # noqa: E402
+
+configure(echo=False)
+
+_sites = itertools.count()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def log_file(tmp_path_factory):
+    # Keep test runs out of the repo's ./app.log
+    path = tmp_path_factory.mktemp("logs") / "app.log"
+    configure(path=str(path))
+    return path
+
+
+@pytest.fixture
+def server():
+    with MockConnectWiseServer(MockConfig(tickets=300, latency_ms=0)) as srv:
+        yield srv
+
+
+@pytest.fixture
+def client(server):
+    # Its own site, so a 429 pause in one test never holds up another
+    scheduler = RequestScheduler(f"test-{next(_sites)}")
+    api = ConnectWiseAPIClient("test", "test", "test-client",
+                               base_url=server.base_url, scheduler=scheduler)
+    yield api
+    api.close()
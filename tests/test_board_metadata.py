@@ -0,0 +1,44 @@
+# tests/test_board_metadata.py
+import json
+import os
+
+from board_metadata import FORMAT_VERSION, BoardMetadataCache
+
+
+def test_refresh_saves_and_reloads(client, tmp_path):
+    path = str(tmp_path / "board_metadata.json")
+    cache = BoardMetadataCache(client, path=path)
+
+    assert cache.refresh(force=True)
+    assert cache.stats()["refreshes"] == 1
+    assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+
+    reloaded = BoardMetadataCache(client, path=path)
+    assert reloaded.board_names() == cache.board_names()
+    assert not reloaded.is_stale()
+
+
+def test_load_skips_malformed_entries(tmp_path):
+    path = tmp_path / "board_metadata.json"
+    path.write_text(json.dumps({
+        "version": FORMAT_VERSION,
+        "fetched_at": 1.0,
+        "boards": [
+            {"id": 1, "name": "Good", "statuses": [{"id": 10, "name": "New"}, {"name": "no id"}]},
+            {"name": "no id"},
+            "not a board",
+            None,
+        ],
+    }))
+
+    cache = BoardMetadataCache(None, path=str(path))
+    assert cache.board_names() == ["Good"]
+    assert cache.status_names("Good") == ["New"]
+
+
+def test_load_ignores_a_file_that_is_not_an_object(tmp_path):
+    path = tmp_path / "board_metadata.json"
+    path.write_text("[1, 2, 3]")
+
+    cache = BoardMetadataCache(None, path=str(path), fallback={"Fallback": ["Open"]})
+    assert cache.board_names() == ["Fallback"]
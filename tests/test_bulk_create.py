@@ -0,0 +1,63 @@
+# tests/test_bulk_create.py
+import requests
+
+from BulkTicketCreator import BulkTicketCreator
+
+
+class FlakyApi:
+    """create_ticket times out; get_tickets behaves as told."""
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self.posts = 0
+        self.lookups = 0
+
+    def create_ticket(self, body):
+        self.posts += 1
+        raise requests.Timeout("no reply")
+
+    def get_tickets(self, **kwargs):
+        self.lookups += 1
+        return self.lookup()
+
+
+def test_failed_existence_check_is_not_reposted():
+    def lookup():
+        raise requests.ConnectionError("lookup down")
+
+    api = FlakyApi(lookup)
+    items, stats = BulkTicketCreator(api, retries=3, check_delay=0.01).create([{"summary": "a"}])
+
+    assert api.posts == 1
+    assert items[0]["status"] == "unknown"
+    assert "not re-posted" in items[0]["error"]
+    assert stats["unknown"] == 1
+
+
+def test_ticket_found_after_timeout_counts_as_created():
+    api = FlakyApi(lambda: [{"id": 42}])
+    items, _ = BulkTicketCreator(api, check_delay=0.01).create([{"summary": "a"}])
+
+    assert api.posts == 1
+    assert items[0]["status"] == "created"
+    assert items[0]["ticket_id"] == 42
+
+
+def test_not_found_is_retried():
+    api = FlakyApi(lambda: [])
+    items, _ = BulkTicketCreator(api, retries=2, checks=2, check_delay=0.01).create([{"summary": "a"}])
+
+    assert api.posts == 3
+    assert api.lookups == 6
+    assert items[0]["status"] == "failed"
+
+
+def test_ticket_committed_late_is_not_reposted():
+    # The first POST is still committing when the first check runs
+    api = FlakyApi(lambda: [{"id": 7}] if api.lookups >= 3 else [])
+    items, _ = BulkTicketCreator(api, check_delay=0.01).create([{"summary": "a"}])
+
+    assert api.posts == 1
+    assert api.lookups == 3
+    assert items[0]["status"] == "created"
+    assert items[0]["ticket_id"] == 7
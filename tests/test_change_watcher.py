@@ -0,0 +1,89 @@
+# tests/test_change_watcher.py
+import time
+
+from ChangeWatcher import ChangeWatcher
+
+BOARD = 'board/name="MNS Config"'
+
+
+def _move(server, ticket_id, when, **changes):
+    ticket = server.update_ticket(ticket_id, **changes)
+    ticket["_info"]["lastUpdated"] = when
+
+
+def _watcher(client, events):
+    shown = client.get_tickets(conditions=BOARD, page_size=1000)
+    watcher = ChangeWatcher(client, BOARD, lambda changed, removed: events.append(
+        ([t["id"] for t in changed], sorted(removed))
+    )).seed(shown)
+    return watcher, [t["id"] for t in shown]
+
+
+def test_idle_poll_reports_nothing(client):
+    events = []
+    watcher, _ = _watcher(client, events)
+
+    assert watcher.poll() is False
+    assert watcher.poll() is False
+    assert events == []
+
+
+def test_adds_updates_and_removals(client, server):
+    events = []
+    watcher, shown = _watcher(client, events)
+    other = next(t for t in server.tickets if t["board"]["name"] != "MNS Config")
+
+    _move(server, shown[0], "2030-01-01T00:00:01Z", summary="edited")
+    _move(server, shown[1], "2030-01-01T00:00:02Z", board={"id": 2, "name": "MNS Activations"})
+    _move(server, other["id"], "2030-01-01T00:00:03Z", board={"id": 1, "name": "MNS Config"})
+
+    assert watcher.poll() is True
+    assert events == [([shown[0], other["id"]], [shown[1]])]
+    assert watcher.watermark == "2030-01-01T00:00:03Z"
+
+    # The boundary ticket comes back (>=) but is not reported again
+    assert watcher.poll() is False
+
+
+def test_removals_across_id_chunks(client, server):
+    events = []
+    watcher, shown = _watcher(client, events)
+    assert len(shown) > watcher.ID_CHUNK
+
+    # The later chunk's ticket left the filter first
+    _move(server, shown[-1], "2030-01-01T00:00:01Z", board={"id": 2, "name": "MNS Activations"})
+    _move(server, shown[0], "2030-01-01T00:00:02Z", board={"id": 2, "name": "MNS Activations"})
+
+    assert watcher.poll() is True
+    assert events == [([], sorted([shown[0], shown[-1]]))]
+    assert watcher.poll() is False
+
+
+
+def test_failed_seeding_is_retried_before_polling(client, server):
+    events = []
+    calls = {"newest": 0}
+    get_tickets = client.get_tickets
+
+    def flaky_get_tickets(**kwargs):
+        if kwargs.get("order_by") == "lastUpdated desc":
+            calls["newest"] += 1
+            if calls["newest"] == 1:
+                raise ConnectionError("site down")
+        return get_tickets(**kwargs)
+
+    client.get_tickets = flaky_get_tickets
+    watcher = ChangeWatcher(client, BOARD, lambda changed, removed: events.append(changed),
+                            interval=0.01, backoff=1)
+    watcher.start()
+    deadline = time.monotonic() + 5
+    while watcher.polls < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    watcher.stop()
+
+    assert calls["newest"] == 2
+    assert watcher.watermark is not None
+    assert watcher.errors == 1
+    # At most the tickets on the boundary second, never the whole filter
+    reported = [t for changed in events for t in changed]
+    assert all(t["_info"]["lastUpdated"] == watcher.watermark for t in reported)
@@ -0,0 +1,37 @@
+# tests/test_cli.py
+import json
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def env(monkeypatch, server):
+    monkeypatch.setenv("CONNECTWISE_USERNAME", "test")
+    monkeypatch.setenv("CONNECTWISE_PASSWORD", "test")
+    monkeypatch.setenv("CONNECTWISE_CLIENT_ID", "test-client")
+    monkeypatch.setenv("CONNECTWISE_BASE_URL", server.base_url)
+    return monkeypatch
+
+
+def test_exports_jsonl(env, capsys):
+    assert cli.main(["--limit", "5"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(rows) == 5
+
+
+def test_limit_zero_exports_nothing(env, capsys):
+    assert cli.main(["--limit", "0"]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_http_error_is_reported_not_raised(env, server, capsys):
+    env.setenv("CONNECTWISE_BASE_URL", server.base_url + "/missing")
+    assert cli.main(["--limit", "5"]) == 1
+    assert capsys.readouterr().err.startswith("Error: ")
+
+
+def test_unwritable_output_is_reported(env, tmp_path, capsys):
+    assert cli.main(["-o", str(tmp_path / "no-such-dir" / "out.jsonl")]) == 1
+    assert "Error: " in capsys.readouterr().err
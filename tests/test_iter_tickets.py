@@ -0,0 +1,42 @@
+# tests/test_iter_tickets.py
+import asyncio
+
+import pytest
+
+from AsyncConnectWiseApi import AsyncConnectWiseAPIClient
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_max_results_yields_nothing(client, server, stream, limit):
+    assert list(client.iter_tickets(max_results=limit, stream=stream)) == []
+    assert server.requests == 0
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_max_results_spans_pages(client, stream):
+    tickets = list(client.iter_tickets(page_size=20, max_results=45, stream=stream))
+    assert len(tickets) == 45
+    assert len({t["id"] for t in tickets}) == 45
+
+
+def test_async_non_positive_max_results_yields_nothing(server):
+    async def run():
+        api = AsyncConnectWiseAPIClient("test", "test", "test-client", base_url=server.base_url)
+        try:
+            return [t async for t in api.iter_tickets(max_results=0)]
+        finally:
+            await api.close()
+
+    assert asyncio.run(run()) == []
+    assert server.requests == 0
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_explicit_fields_are_not_counted_as_the_profile(client, stream):
+    list(client.iter_tickets(max_results=5, stream=stream))
+    list(client.iter_tickets(max_results=5, fields="id", stream=stream))
+
+    stats = client.payload_stats()
+    assert stats["list"]["requests"] == 1
+    assert stats["custom"]["requests"] == 1
@@ -0,0 +1,66 @@
+# tests/test_json_stream.py
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_every_split_point():
+    doc = [{"id": 1, "summary": "a \"quoted\" [bracket], {brace}"}, 23, -4.5e3, "x,y", True, None,
+           [1, [2]], {"nested": {"k": [1, 2, 3]}}]
+    data = json.dumps(doc).encode("utf-8")
+
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_array(_chunks(data, size), compact_at=8)) == doc
+
+
+def test_number_split_across_chunks():
+    assert list(iter_json_array([b"[1, 23", b"4]"])) == [1, 234]
+    assert list(iter_json_array([b"[1.", b"5e", b"2, -", b"3]"])) == [150.0, -3]
+    assert list(iter_json_array([b"[tr", b"ue, nu", b"ll]"])) == [True, None]
+
+
+def test_multibyte_utf8_split_across_chunks():
+    data = json.dumps(["café", "日本"], ensure_ascii=False).encode("utf-8")
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_array(_chunks(data, size))) == ["café", "日本"]
+
+
+def test_whitespace_and_empty_array():
+    assert list(iter_json_array([b" \n[ ", b"\t]\r\n"])) == []
+    assert list(iter_json_array([b"[]"])) == []
+    assert list(iter_json_array([" [ 1 ,\n 2 ] "])) == [1, 2]
+
+
+def test_yields_before_the_stream_ends():
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("read past the first element")
+
+    assert next(iter_json_array(chunks())) == {"id": 1}
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'{"id": 1}'],
+    [b""],
+    [],
+    [b"[1, 2"],
+    [b'[{"id": 1}, {"id"'],
+    [b'["unterminated'],
+    [b"[1 2]"],
+    [b"[,1,,2,]"],
+    [b"[1,]"],
+    [b"[1,,2]"],
+    [b'[{"a":1}{"b":2}]'],
+    [b"[1]garbage"],
+    [b"[1] ", b"[2]"],
+    [b"[1", b"]x"],
+])
+def test_malformed_raises_value_error(chunks):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks))
@@ -0,0 +1,61 @@
+# tests/test_lookup_cache.py
+import os
+import threading
+import time
+
+from lookup_cache import LookupCache
+
+
+def test_concurrent_puts_save_without_errors(tmp_path):
+    path = str(tmp_path / "lookup_cache.json")
+    cache = LookupCache(path=path, save_interval=0)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(100):
+                cache.put(("company", f"c{n}-{i}"), {"id": i})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    cache.flush()
+    assert errors == []
+    assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+    assert LookupCache(path=path).get(("company", "c7-99")) == {"id": 99}
+
+
+def test_saves_are_batched_and_flushed(tmp_path):
+    path = str(tmp_path / "lookup_cache.json")
+    cache = LookupCache(path=path, save_interval=3600)
+
+    cache.put(("company", "a"), {"id": 1})     # first change is saved straight away...
+    _wait_for(lambda: os.path.exists(path))
+    cache.put(("company", "b"), {"id": 2})     # ...the rest wait for the interval
+    assert LookupCache(path=path).get(("company", "b")) is LookupCache.MISSING
+
+    cache.flush()
+    assert LookupCache(path=path).get(("company", "b")) == {"id": 2}
+
+
+def test_put_does_not_write_on_the_calling_thread(tmp_path, monkeypatch):
+    cache = LookupCache(path=str(tmp_path / "lookup_cache.json"), save_interval=0)
+    writers = []
+    save = cache.save
+    monkeypatch.setattr(cache, "save", lambda: (writers.append(threading.current_thread()), save()))
+
+    cache.put(("company", "a"), {"id": 1})
+    _wait_for(lambda: writers)
+    assert threading.current_thread() not in writers
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
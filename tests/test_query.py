@@ -0,0 +1,78 @@
+# tests/test_query.py
+from datetime import datetime
+
+import pytest
+
+from query import Query, literal
+
+
+def test_literal_escapes_and_normalises():
+    assert literal('  MNS   "Config" \\ x ') == '"MNS \\"Config\\" \\\\ x"'
+    assert literal(42) == "42"
+    assert literal(True) == "true"
+    assert literal(datetime(2024, 1, 2, 3, 4, 5)) == "[2024-01-02T03:04:05Z]"
+
+
+def test_blank_filters_are_skipped():
+    assert Query.tickets(company="", owner="  ", board=None).conditions() is None
+    assert not Query()
+    assert str(Query()) == ""
+
+
+def test_company_needs_no_lookup():
+    assert Query().company("ACME").conditions() == 'company/identifier="ACME"'
+    assert Query().company(7).conditions() == "company/id=7"
+
+
+def test_keys_are_stable_across_build_order_and_case():
+    a = Query().owner("JDoe").status("New").board("MNS Config")
+    b = Query().board("MNS Config").status("New").owner("jdoe")
+    assert a.key() == b.key()
+    assert a == b
+
+
+def test_or_groups_are_parenthesised():
+    query = Query().company_like("acme").status("New")
+    assert query.conditions() == (
+        '(company/identifier contains "acme" OR company/name contains "acme") '
+        'AND status/name="New"'
+    )
+
+    nested = Query().any_of(Query().status("New").board("A"), Query().status("Open"))
+    assert nested.conditions() == '((board/name="A" AND status/name="New") OR status/name="Open")'
+
+
+@pytest.mark.parametrize("text", [
+    'status/name="New" OR status/name="Open"',
+    'status/name="New" or status/name="Open"',
+    'status/name="New"',
+])
+def test_raw_text_is_always_one_clause(text):
+    query = Query().company("C1").raw(text)
+    assert query.conditions() == f'({text}) AND company/identifier="C1"'
+
+
+def test_raw_keeps_already_wrapped_text():
+    assert Query().raw('(a=1 or b=2)').conditions() == "(a=1 or b=2)"
+    assert Query().raw('(a=1) or (b=2)').conditions() == "((a=1) or (b=2))"
+
+
+def test_one_of_and_updated_since():
+    query = Query().one_of("id", [3, 1, 2, 1]).updated_since("2024-01-01T00:00:00Z")
+    assert query.conditions() == "id in (1,2,3) AND lastUpdated >= [2024-01-01T00:00:00Z]"
+    with pytest.raises(ValueError):
+        Query().one_of("id", [])
+
+
+def test_query_is_not_hashable():
+    with pytest.raises(TypeError):
+        hash(Query().status("New"))
+
+
+def test_company_filter_applies_to_every_or_branch(client):
+    tickets = client.get_tickets_by_company(
+        "Company1", 'status/name="Open" or status/name="Fail"', page_size=1000
+    )
+    assert tickets
+    assert {t["company"]["identifier"] for t in tickets} == {"Company1"}
+    assert {t["status"]["name"] for t in tickets} <= {"Open", "Fail"}
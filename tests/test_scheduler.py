@@ -0,0 +1,160 @@
+# tests/test_scheduler.py
+import time
+
+import pytest
+import requests
+
+from scheduler import CircuitBreaker, CircuitOpenError, RequestScheduler, TokenBucket
+
+
+class _Response:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _scheduler(name, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    return RequestScheduler(f"sched-{name}-{time.monotonic()}", **kwargs)
+
+
+def _sender(*outcomes):
+    outcomes = list(outcomes)
+    calls = []
+
+    def send():
+        calls.append(time.monotonic())
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+def test_default_limiter_does_not_throttle():
+    scheduler = _scheduler("default")
+    send, calls = _sender(*[_Response(200) for _ in range(200)])
+
+    started = time.monotonic()
+    for _ in range(200):
+        scheduler.execute("GET", send)
+
+    assert time.monotonic() - started < 0.5
+
+
+def test_configured_rate_is_enforced():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - started >= 0.09
+
+
+def test_429_honours_retry_after_and_retries_post():
+    scheduler = _scheduler("429")
+    first = _Response(429, {"Retry-After": "0.2"})
+    send, calls = _sender(first, _Response(201))
+
+    response = scheduler.execute("POST", send)
+
+    assert response.status_code == 201
+    assert first.closed
+    assert calls[1] - calls[0] >= 0.2
+    assert scheduler.state()["throttled"] == 1
+
+
+def test_5xx_retried_for_get_only():
+    scheduler = _scheduler("5xx")
+    send, calls = _sender(_Response(503), _Response(502), _Response(200))
+    assert scheduler.execute("GET", send).status_code == 200
+    assert len(calls) == 3
+    assert scheduler.state()["retries"] == 2
+
+    send, calls = _sender(_Response(503))
+    assert scheduler.execute("POST", send).status_code == 503
+    assert len(calls) == 1
+
+
+def test_connection_errors_give_up_after_max_retries():
+    scheduler = _scheduler("conn", max_retries=2)
+    send, calls = _sender(*[requests.ConnectionError()] * 3)
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.execute("GET", send)
+    assert len(calls) == 3
+
+
+def test_backoff_is_bounded():
+    scheduler = _scheduler("backoff", backoff_base=1, backoff_max=4)
+    assert all(0 <= scheduler._backoff(attempt) <= 4 for attempt in range(10))
+
+
+def test_breaker_opens_then_closes_after_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    scheduler = _scheduler("breaker", max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            scheduler.execute("GET", _sender(requests.ConnectionError())[0])
+    assert breaker.state()["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        scheduler.execute("GET", _sender(_Response(200))[0])
+
+    time.sleep(0.15)
+    assert breaker.state()["state"] == "half-open"
+    assert scheduler.execute("GET", _sender(_Response(200))[0]).status_code == 200
+    assert breaker.state()["state"] == "closed"
+
+
+def test_unexpected_error_during_trial_does_not_wedge_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    scheduler = _scheduler("wedge", max_retries=0, breaker=breaker)
+
+    with pytest.raises(requests.ConnectionError):
+        scheduler.execute("GET", _sender(requests.ConnectionError())[0])
+    time.sleep(0.06)
+
+    # The half-open trial fails with something other than a connection error
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        scheduler.execute("GET", _sender(requests.exceptions.ChunkedEncodingError())[0])
+
+    time.sleep(0.06)
+    assert scheduler.execute("GET", _sender(_Response(200))[0]).status_code == 200
+    assert breaker.state()["state"] == "closed"
+
+
+def test_rate_without_burst_defaults_capacity():
+    bucket = TokenBucket(5)
+    assert bucket.capacity == 5
+    bucket.acquire()
+
+    scheduler = _scheduler("no-burst", rate=0.5)
+    assert scheduler.bucket.capacity == 1
+    scheduler.bucket.acquire()
+
+
+def test_site_limits_are_shared_and_conflicts_raise():
+    first = _scheduler("site", site_rate=2)
+    site = first.site
+
+    same = RequestScheduler(site, site_rate=2)
+    unspecified = RequestScheduler(site)
+    assert same.site_bucket is first.site_bucket is unspecified.site_bucket
+
+    with pytest.raises(ValueError):
+        RequestScheduler(site, site_rate=100)
+
+
+def test_site_limits_apply_to_an_unlimited_site_bucket():
+    unlimited = _scheduler("late-limit")
+    limited = RequestScheduler(unlimited.site, site_rate=3, site_burst=6)
+
+    assert limited.site_bucket is unlimited.site_bucket
+    assert unlimited.site_bucket.state()["rate"] == 3
+    assert unlimited.site_bucket.capacity == 6
@@ -0,0 +1,68 @@
+# tests/test_search_index.py
+import pytest
+
+from SearchIndex import TicketSearchIndex, to_match_query
+
+
+def _ticket(tid, summary, board="MNS Config", status="New"):
+    return {"id": tid, "summary": summary, "company": {"name": "ACME"},
+            "board": {"name": board}, "status": {"name": status}}
+
+
+def _note(text, **flags):
+    return dict({"text": text}, **flags)
+
+
+@pytest.fixture
+def index():
+    idx = TicketSearchIndex(":memory:")
+    idx.index_tickets([
+        _ticket(1, "Firewall reboot loop"),
+        _ticket(2, "Printer offline", status="Closed"),
+        _ticket(3, "Replace switch", board="MNS Activations"),
+        _ticket(4, "New user setup"),
+    ])
+    idx.index_notes(2, [_note("Firewall blocked the print spooler", detailDescriptionFlag=True)])
+    idx.index_notes(3, [_note("firewall mentioned in passing", internalAnalysisFlag=True),
+                        _note("Swapped the switch at 10.0.0.1", resolutionFlag=True)])
+    yield idx
+    idx.close()
+
+
+def test_summary_outranks_description_outranks_analysis(index):
+    assert [r["id"] for r in index.search("firewall")] == [1, 2, 3]
+
+
+def test_notes_merge_with_list_fields(index):
+    (hit,) = index.search("spooler")
+    assert hit["id"] == 2
+    assert hit["summary"] == "Printer offline"
+    assert hit["status"] == "Closed"
+    assert "[spooler]" in hit["snippet"]
+
+
+def test_reindexing_a_ticket_keeps_its_notes(index):
+    index.index_tickets([_ticket(2, "Printer back online", status="Closed")])
+    assert [r["id"] for r in index.search("spooler")] == [2]
+    assert [r["id"] for r in index.search("online")] == [2]
+    assert index.search("offline") == []
+
+
+def test_filters_and_limit(index):
+    assert [r["id"] for r in index.search("firewall", board="MNS Activations")] == [3]
+    assert [r["id"] for r in index.search("firewall", status="Closed")] == [2]
+    assert len(index.search("firewall", limit=2)) == 2
+
+
+def test_punctuation_prefixes_and_phrases(index):
+    assert [r["id"] for r in index.search("10.0.0.1")] == [3]
+    assert [r["id"] for r in index.search("fire*")] == [1, 2, 3]
+    assert [r["id"] for r in index.search('"reboot loop"')] == [1]
+    assert index.search('"loop reboot"') == []
+    assert index.search("*") == []
+    assert index.search("   ") == []
+
+
+def test_to_match_query_quotes_every_term():
+    assert to_match_query('AND "a "b*') == '"AND" "a " "b"*'
+    assert to_match_query('x"y') == '"x""y"'
@@ -0,0 +1,34 @@
+# tests/test_stream_cache.py
+
+
+def _search(client, **kwargs):
+    return [t["id"] for t in client.iter_tickets(
+        conditions='board/name="MNS Config"', max_results=50, use_cache=True, **kwargs
+    )]
+
+
+def test_streamed_full_page_is_cached(client, server):
+    first = _search(client, stream=True)
+    requests = server.requests
+    second = _search(client, stream=True)
+
+    assert first == second
+    assert len(first) == 50
+    assert client.result_cache.stats()["entries"] == 1
+    assert client.result_cache.stats()["hits"] == 1
+    # Only the background revalidation probe went to the server
+    client._revalidator.shutdown(wait=True)
+    assert server.requests - requests <= 1
+
+
+def test_streamed_and_buffered_share_cache_entries(client):
+    assert _search(client, stream=True) == _search(client, stream=False)
+    assert client.result_cache.stats()["entries"] == 1
+
+
+def test_abandoned_page_is_not_cached(client):
+    tickets = client.stream_tickets(page_size=100, use_cache=True)
+    next(tickets)
+    tickets.close()
+
+    assert client.result_cache.stats()["entries"] == 0
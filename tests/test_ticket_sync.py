@@ -0,0 +1,85 @@
+# tests/test_ticket_sync.py
+import pytest
+
+import TicketStore
+from TicketStore import TicketStore as Store, TicketSync
+
+
+@pytest.fixture
+def store(tmp_path):
+    db = Store(str(tmp_path / "tickets.db"))
+    yield db
+    db.close()
+
+
+def test_sync_fields_include_team(client, store):
+    # The Team column is filled from the stored payload
+    assert "team/name" in TicketStore.SYNC_FIELDS.split(",")
+
+    TicketSync(client, store).sync()
+    tickets, _ = store.query(limit=1)
+    assert tickets[0]["team"]["name"] == "Provisioning"
+
+
+def test_changed_sync_fields_trigger_a_full_sync(client, server, store, monkeypatch):
+    assert TicketSync(client, store).sync()["fetched"] == 300
+    assert TicketSync(client, store).sync()["fetched"] < 300
+
+    monkeypatch.setattr(TicketStore, "SYNC_FIELDS", TicketStore.SYNC_FIELDS + ",contact/name")
+    assert TicketSync(client, store).sync()["fetched"] == 300
+    # ...and only once
+    assert TicketSync(client, store).sync()["fetched"] < 300
+
+
+def test_sync_advances_and_persists_the_watermark(client, server, tmp_path):
+    path = str(tmp_path / "tickets.db")
+    newest = max(t["_info"]["lastUpdated"] for t in server.tickets)
+
+    store = Store(path)
+    first = TicketSync(client, store).sync()
+    store.close()
+    assert first["fetched"] == 300
+    assert first["watermark"] == newest
+
+    # A new process picks up where the last one stopped
+    store = Store(path)
+    try:
+        assert store.get_watermark() == newest
+        assert store.count() == 300
+
+        server.update_ticket(server.tickets[5]["id"], summary="edited")
+        again = TicketSync(client, store).sync()
+
+        edited = server.tickets[5]["_info"]["lastUpdated"]
+        assert again["watermark"] == edited > newest
+        # The edit plus the boundary second (>=), not the whole table
+        assert 1 <= again["fetched"] < 10
+        tickets, _ = store.query(limit=1)
+        assert tickets[0]["summary"] == "edited"
+    finally:
+        store.close()
+
+
+def test_interrupted_sync_keeps_the_last_batch_watermark(client, store, monkeypatch):
+    iter_tickets = client.iter_tickets
+
+    def dies_after(n):
+        def iterate(**kwargs):
+            for i, ticket in enumerate(iter_tickets(**kwargs)):
+                if i == n:
+                    raise ConnectionError("dropped")
+                yield ticket
+        return iterate
+
+    monkeypatch.setattr(client, "iter_tickets", dies_after(120))
+    with pytest.raises(ConnectionError):
+        TicketSync(client, store, batch_size=50).sync()
+
+    partial = store.get_watermark()
+    assert store.count() == 100
+    assert partial is not None
+
+    monkeypatch.setattr(client, "iter_tickets", iter_tickets)
+    resumed = TicketSync(client, store, batch_size=50).sync()
+    assert store.count() == 300
+    assert resumed["fetched"] < 300
@@ -0,0 +1,24 @@
+# tests/test_transport.py
+import gc
+import threading
+
+
+def test_sessions_released_when_threads_end(client):
+    def search():
+        list(client.iter_tickets(max_results=5))
+
+    for _ in range(50):
+        worker = threading.Thread(target=search)
+        worker.start()
+        worker.join()
+
+    gc.collect()
+    # At most the main thread's plus whatever a live executor still holds
+    assert len(client.transport._sessions) <= 2
+
+
+def test_close_still_closes_live_sessions(client):
+    client.get_tickets(page_size=1)
+    assert len(client.transport._sessions) == 1
+    client.close()
+    assert len(client.transport._sessions) == 0
@@ -0,0 +1,103 @@
+# transport.py
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpTransport:
+    """
+    Pooled, keep-alive HTTP transport shared by every ConnectWiseAPIClient call.
+
+    One HTTPAdapter (and therefore one urllib3 connection pool) is shared by
+    all threads, while each thread gets its own requests.Session on top of it
+    so per-session state such as cookies is never mutated concurrently. A
+    thread's Session is dropped when the thread ends.
+    """
+
+    def __init__(self, auth=None, headers=None, pool_connections=4,
+                 pool_maxsize=16, timeout=(5, 30)):
+        self.auth = auth
+        self.timeout = timeout
+        self.headers = {
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        self.headers.update(headers or {})
+
+        # pool_block=True makes extra threads wait for a free connection
+        # instead of opening throwaway ones beyond pool_maxsize.
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True
+        )
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Weak: the thread-local owns each Session, so it goes with its thread
+        self._sessions = weakref.WeakSet()
+        self._requests_sent = 0
+
+    # ---------------------------------------
+    # SESSIONS
+    # ---------------------------------------
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.auth = self.auth
+            session.headers.update(self.headers)
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.add(session)
+        return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests_sent += 1
+        return self._session().request(method, url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        self.adapter.close()
+
+    # ---------------------------------------
+    # POOL USAGE
+    # ---------------------------------------
+    def pool_stats(self):
+        """
+        Returns connection pool usage.
+
+        Returns:
+            dict: requests sent, connections opened, connections reused
+                  and the number of idle connections per host.
+        """
+        opened = 0
+        served = 0
+        idle = {}
+
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            served += pool.num_requests
+            slots = list(pool.pool.queue) if pool.pool else []
+            idle[f"{pool.scheme}://{pool.host}:{pool.port}"] = sum(1 for c in slots if c is not None)
+
+        return {
+            "requests": self._requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(served - opened, 0),
+            "idle": idle,
+        }